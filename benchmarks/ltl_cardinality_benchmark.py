@@ -0,0 +1,63 @@
+"""Benchmark of the LTLf translation of Existence, Absence and Exactly
+constraints of growing cardinality. Each translation is timed with cold
+caches, and again once its skeleton is cached. The cold time per n stays
+about constant, since the skeleton of n wraps the one of n - 1.
+
+Run from the repository root:
+
+    python benchmarks/ltl_cardinality_benchmark.py
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from timeit import default_timer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bpmnconstraints.compiler.ltl.declare2ltl import (
+    Declare2ltl,
+    COUNTING_TEMPLATES,
+)
+
+
+def time_translation(template, n, repeat, cold):
+    ltl = Declare2ltl()
+    best = None
+    for i in range(repeat):
+        if cold:
+            Declare2ltl.cache_clear()
+        # A new activity per run, so that the translation itself is not cached.
+        constraint = f"{template}{n}[activity {i}]"
+        start = default_timer()
+        ltl.to_ltl_str(constraint)
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 1000, 10000],
+        help="Cardinalities of the constraints",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size")
+    args = parser.parse_args()
+
+    print(f"{'template':<12}{'n':>8}{'cold':>12}{'us/n':>10}{'cached':>12}")
+    for template in COUNTING_TEMPLATES:
+        for n in args.sizes:
+            cold = time_translation(template, n, args.repeat, True)
+            cached = time_translation(template, n, args.repeat, False)
+            print(
+                f"{template:<12}{n:>8}{cold:>12.6f}"
+                f"{cold / n * 1e6:>10.2f}{cached:>12.6f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark of the parse time of the example diagrams and of synthetic
+diagrams of growing size.
+
+Run from the repository root:
+
+    python benchmarks/parser_benchmark.py
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+from timeit import default_timer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bpmnconstraints.parser.bpmn_parser import Parser
+from synthetic_models import json_model, xml_model
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def time_parse(path, repeat):
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        Parser(path, True, False).run()
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_examples(repeat):
+    print(f"{'example':<64}{'seconds':>12}")
+    for path in sorted(EXAMPLES.rglob("*.json")) + sorted(EXAMPLES.rglob("*.xml")):
+        print(f"{str(path.relative_to(EXAMPLES)):<64}{time_parse(path, repeat):>12.4f}")
+
+
+def bench_synthetic(sizes, repeat):
+    print(f"{'format':<8}{'elements':>10}{'seconds':>12}{'us/element':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for blocks in sizes:
+            model = json_model(blocks)
+            elements = len(model["childShapes"])
+
+            json_path = Path(directory) / f"synthetic_{blocks}.json"
+            json_path.write_text(json.dumps(model), encoding="utf-8")
+            xml_path = Path(directory) / f"synthetic_{blocks}.xml"
+            xml_path.write_text(xml_model(blocks), encoding="utf-8")
+
+            for name, path in (("json", json_path), ("xml", xml_path)):
+                seconds = time_parse(path, repeat)
+                print(
+                    f"{name:<8}{elements:>10}{seconds:>12.4f}"
+                    f"{seconds / elements * 1e6:>14.1f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[25, 50, 100, 200, 400],
+        help="Number of blocks of the synthetic diagrams",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per diagram")
+    parser.add_argument(
+        "--skip_examples", action="store_true", help="Only run synthetic diagrams"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if not args.skip_examples:
+        bench_examples(args.repeat)
+        print()
+    bench_synthetic(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
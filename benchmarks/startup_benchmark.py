@@ -0,0 +1,115 @@
+"""Benchmark of the startup cost of each CLI subcommand. Every subcommand is
+run in a fresh interpreter with `python -X importtime`, on a small example
+diagram or dataset. The import time is the sum of the top level imports
+reported by the interpreter, the wall time covers the whole call.
+
+Run from the repository root:
+
+    python benchmarks/startup_benchmark.py
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from timeit import default_timer
+
+ROOT = Path(__file__).resolve().parents[1]
+DIAGRAM = ROOT / "examples" / "linear" / "linear_sequence.json"
+PACKAGES = ["pandas", "numpy", "matplotlib", "pylogics", "sqlite3"]
+
+
+def subcommands(dataset, dataframe):
+    return {
+        "--parse": ["--parse", str(DIAGRAM)],
+        "--compile": ["--compile", str(DIAGRAM)],
+        "--compile --constraint_type": [
+            "--compile",
+            str(DIAGRAM),
+            "--constraint_type",
+            "DECLARE",
+        ],
+        "--compile_to_mermaid": ["--compile_to_mermaid", str(DIAGRAM)],
+        "--parse_dataset": ["--parse_dataset", str(dataset)],
+        "--compile_dataset": ["--compile_dataset", str(dataset)],
+        "--compare_constraints": [
+            "--compare_constraints",
+            "True",
+            "--dataset",
+            str(dataset / "models.csv"),
+            "--dataframe",
+            str(dataframe),
+        ],
+    }
+
+
+def create_dataset(directory):
+    dataset = directory / "dataset"
+    dataset.mkdir()
+    with open(dataset / "models.csv", "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, ["Model ID", "Model JSON"])
+        writer.writeheader()
+        writer.writerow({"Model ID": 0, "Model JSON": DIAGRAM.read_text()})
+
+    import pandas as pd
+
+    dataframe = directory / "constraints.pkl"
+    pd.DataFrame(
+        [{"model_id": 0, "constraints": ["Init[register invoice] | support: 1.0"]}]
+    ).to_pickle(dataframe)
+    return dataset, dataframe
+
+
+def run_subcommand(arguments):
+    """Returns the total import time in seconds, the wall time in seconds and
+    the heavy packages imported by one call of the CLI."""
+    code = (
+        "import sys; from bpmnconstraints.script import run; "
+        f"sys.argv = ['bpmnconstraints'] + {arguments!r}; run()"
+    )
+    environment = dict(os.environ, PYTHONPATH=str(ROOT))
+    start = default_timer()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=False,
+    )
+    wall = default_timer() - start
+
+    microseconds = 0
+    imported = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        if not name.startswith("  "):
+            microseconds += int(cumulative)
+        imported.add(name.strip().split(".")[0])
+    return microseconds / 1e6, wall, [p for p in PACKAGES if p in imported]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per subcommand")
+    args = parser.parse_args()
+
+    print(f"{'subcommand':<30}{'imports':>10}{'wall':>10}  heavy packages")
+    with tempfile.TemporaryDirectory() as directory:
+        dataset, dataframe = create_dataset(Path(directory))
+        for name, arguments in subcommands(dataset, dataframe).items():
+            runs = [run_subcommand(arguments) for _ in range(args.repeat)]
+            import_seconds = min(run[0] for run in runs)
+            wall_seconds = min(run[1] for run in runs)
+            packages = ", ".join(runs[0][2]) or "-"
+            print(f"{name:<30}{import_seconds:>10.3f}{wall_seconds:>10.3f}  {packages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Generators for synthetic BPMN diagrams used by the benchmarks.
+
+A model is a start event, followed by a number of blocks and an end event.
+Every third block is an exclusive split with two branches that join again,
+the other blocks are single tasks.
+"""
+
+from xml.sax.saxutils import quoteattr
+
+BPMN_NAMESPACE = "http://www.omg.org/spec/BPMN/20100524/MODEL"
+NAMESPACES = (
+    f'xmlns="{BPMN_NAMESPACE}" '
+    'xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI" '
+    'xmlns:omgdc="http://www.omg.org/spec/DD/20100524/DC" '
+    'xmlns:omgdi="http://www.omg.org/spec/DD/20100524/DI"'
+)
+
+
+def _build_graph(blocks):
+    nodes = [("start", "StartNoneEvent", "start")]
+    flows = []
+    previous = "start"
+
+    for i in range(blocks):
+        if i % 3 == 2:
+            split, join = f"split{i}", f"join{i}"
+            left, right = f"task{i}a", f"task{i}b"
+            nodes += [
+                (split, "Exclusive_Databased_Gateway", None),
+                (left, "Task", f"activity {i} left"),
+                (right, "Task", f"activity {i} right"),
+                (join, "Exclusive_Databased_Gateway", None),
+            ]
+            flows += [
+                (previous, split),
+                (split, left),
+                (split, right),
+                (left, join),
+                (right, join),
+            ]
+            previous = join
+        else:
+            task = f"task{i}"
+            nodes.append((task, "Task", f"activity {i}"))
+            flows.append((previous, task))
+            previous = task
+
+    nodes.append(("end", "EndNoneEvent", "end"))
+    flows.append((previous, "end"))
+    return nodes, flows
+
+
+def json_model(blocks):
+    """Returns a Signavio JSON diagram with the given number of blocks."""
+    nodes, flows = _build_graph(blocks)
+    outgoing = {node_id: [] for node_id, _, _ in nodes}
+    shapes = []
+
+    for i, (source, target) in enumerate(flows):
+        flow_id = f"flow{i}"
+        outgoing[source].append({"resourceId": flow_id})
+        shapes.append(
+            {
+                "resourceId": flow_id,
+                "stencil": {"id": "SequenceFlow"},
+                "properties": {},
+                "outgoing": [{"resourceId": target}],
+                "childShapes": [],
+            }
+        )
+
+    for node_id, stencil, name in nodes:
+        properties = {} if name is None else {"name": name}
+        shapes.append(
+            {
+                "resourceId": node_id,
+                "stencil": {"id": stencil},
+                "properties": properties,
+                "outgoing": outgoing[node_id],
+                "childShapes": [],
+            }
+        )
+
+    return {
+        "resourceId": "canvas",
+        "stencil": {"id": "BPMNDiagram"},
+        "properties": {},
+        "childShapes": shapes,
+    }
+
+
+def _diagram(nodes, flows):
+    rows = ['<bpmndi:BPMNDiagram id="diagram">', '<bpmndi:BPMNPlane id="plane">']
+
+    for i, (node_id, _, _) in enumerate(nodes):
+        rows += [
+            f'<bpmndi:BPMNShape bpmnElement="{node_id}" id="{node_id}_gui">',
+            f'<omgdc:Bounds height="80.0" width="100.0" x="{i * 150}.0" y="100.0"/>',
+            "<bpmndi:BPMNLabel>",
+            f'<omgdc:Bounds height="12.0" width="80.0" x="{i * 150}.0" y="130.0"/>',
+            "</bpmndi:BPMNLabel>",
+            "</bpmndi:BPMNShape>",
+        ]
+
+    for i in range(len(flows)):
+        rows += [
+            f'<bpmndi:BPMNEdge bpmnElement="flow{i}" id="flow{i}_gui">',
+            f'<omgdi:waypoint x="{i * 150 + 100}.0" y="140.0"/>',
+            f'<omgdi:waypoint x="{i * 150 + 125}.0" y="140.0"/>',
+            f'<omgdi:waypoint x="{i * 150 + 150}.0" y="140.0"/>',
+            "</bpmndi:BPMNEdge>",
+        ]
+
+    rows += ["</bpmndi:BPMNPlane>", "</bpmndi:BPMNDiagram>"]
+    return "\n".join(rows)
+
+
+def xml_model(blocks, with_diagram=False):
+    """Returns a BPMN 2.0 XML document with the given number of blocks. With
+    with_diagram, the document also holds diagram interchange shapes and edges
+    for every element, as exported by modeling tools."""
+    nodes, flows = _build_graph(blocks)
+    outgoing = {node_id: [] for node_id, _, _ in nodes}
+    tags = {
+        "StartNoneEvent": "startEvent",
+        "EndNoneEvent": "endEvent",
+        "Task": "task",
+        "Exclusive_Databased_Gateway": "exclusiveGateway",
+    }
+    rows = []
+
+    for i, (source, _) in enumerate(flows):
+        outgoing[source].append(f"flow{i}")
+
+    for node_id, stencil, name in nodes:
+        name_attr = "" if name is None else f" name={quoteattr(name)}"
+        rows.append(f'<{tags[stencil]} id="{node_id}"{name_attr}>')
+        rows += [f"<outgoing>{flow_id}</outgoing>" for flow_id in outgoing[node_id]]
+        rows.append(f"</{tags[stencil]}>")
+
+    for i, (source, target) in enumerate(flows):
+        rows.append(
+            f'<sequenceFlow id="flow{i}" sourceRef="{source}" targetRef="{target}"/>'
+        )
+
+    body = "\n".join(rows)
+    diagram = _diagram(nodes, flows) if with_diagram else ""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<definitions {NAMESPACES} id="definitions">'
+        f'<process id="process">\n{body}\n</process>\n{diagram}'
+        "</definitions>"
+    )
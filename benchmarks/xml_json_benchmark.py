@@ -0,0 +1,49 @@
+"""Benchmark comparing the parse time of the XML and JSON version of each
+example diagram.
+
+Run from the repository root:
+
+    python benchmarks/xml_json_benchmark.py
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from parser_benchmark import EXAMPLES, time_parse
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per diagram")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(f"{'example':<64}{'json':>10}{'xml':>10}{'xml/json':>10}")
+
+    json_total = 0
+    xml_total = 0
+    for json_path in sorted(EXAMPLES.rglob("*.json")):
+        xml_path = json_path.with_suffix(".xml")
+        if not xml_path.is_file():
+            continue
+
+        json_seconds = time_parse(json_path, args.repeat)
+        xml_seconds = time_parse(xml_path, args.repeat)
+        json_total += json_seconds
+        xml_total += xml_seconds
+
+        name = str(json_path.relative_to(EXAMPLES).with_suffix(""))
+        print(
+            f"{name:<64}{json_seconds:>10.4f}{xml_seconds:>10.4f}"
+            f"{xml_seconds / json_seconds:>10.1f}"
+        )
+
+    print(
+        f"{'total':<64}{json_total:>10.4f}{xml_total:>10.4f}"
+        f"{xml_total / json_total:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark comparing the load time and peak memory of reading a BPMN XML file
+with ElementTree.parse and with the streaming loader used by the parser.
+
+Run from the repository root:
+
+    python benchmarks/xml_loading_benchmark.py
+"""
+
+import argparse
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from timeit import default_timer
+from xml.etree import ElementTree
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bpmnconstraints.parser.xml_model import iterparse_bpmn
+from synthetic_models import xml_model
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+LOADERS = {
+    "parse": lambda path: ElementTree.parse(path).getroot(),
+    "iterparse": iterparse_bpmn,
+}
+
+
+def measure(loader, path):
+    start = default_timer()
+    loader(path)
+    seconds = default_timer() - start
+
+    tracemalloc.start()
+    loader(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def report(name, path):
+    row = f"{name:<40}{path.stat().st_size / 1024:>10.0f}"
+    for loader in LOADERS.values():
+        seconds, peak = measure(loader, path)
+        row += f"{seconds:>12.4f}{peak / 1024:>12.0f}"
+    print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000],
+        help="Number of blocks of the synthetic diagrams",
+    )
+    args = parser.parse_args()
+
+    header = f"{'diagram':<40}{'KiB':>10}"
+    for loader in LOADERS:
+        header += f"{loader + ' s':>12}{loader + ' KiB':>12}"
+    print(header)
+
+    for path in sorted(EXAMPLES.rglob("*.xml")):
+        report(str(path.relative_to(EXAMPLES)), path)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for blocks in args.sizes:
+            path = Path(directory) / f"synthetic_{blocks}.xml"
+            path.write_text(xml_model(blocks, with_diagram=True), encoding="utf-8")
+            report(f"synthetic {blocks} blocks", path)
+
+
+if __name__ == "__main__":
+    main()
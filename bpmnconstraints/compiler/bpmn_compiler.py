@@ -1,29 +1,67 @@
 from itertools import combinations
 from bpmnconstraints.templates.declare_templates import Declare
 from bpmnconstraints.templates.matching_templates import Signal
-from bpmnconstraints.compiler.ltl.declare2ltl import Declare2ltl
+from bpmnconstraints.compiler.constraint_record import ConstraintRecord, Template
 from bpmnconstraints.utils.constants import *
 
 
 class Compiler:
-    def __init__(self, sequence, transitivity, skip_named_gateways) -> None:
+    """Compiles a parsed sequence to constraints. The compiler emits a
+    ConstraintRecord per constraint, which is rendered to its description and
+    the given formats, out of SIGNAL, DECLARE and LTLf, which default to all
+    three, only when it is read from constraints. LTLf is rendered through
+    pylogics, which is only imported if it is requested."""
+
+    def __init__(
+        self, sequence, transitivity, skip_named_gateways, formats=None
+    ) -> None:
         self.sequence = sequence
         self.transitivity = transitivity
+        self.formats = set(CONSTRAINT_TYPES.values()) if formats is None else formats
         self.declare = Declare()
         self.signal = Signal()
-        self.ltlf = Declare2ltl()
+        self.ltlf = None
+        if LTLF in self.formats:
+            from bpmnconstraints.compiler.ltl.declare2ltl import Declare2ltl
+
+            self.ltlf = Declare2ltl()
         self.concurrent = True
         self.compiled_sequence = []
         self.cfo = None
         self.skip_named_gateways = skip_named_gateways
 
     def run(self):
+        return list(self.constraints())
+
+    def constraints(self):
+        """Yields the rendered constraints one by one, so that each can be
+        written out before the next one is rendered."""
+        for record in self.compile():
+            yield self.render(record)
+
+    def compile(self):
+        """Returns the constraint records of the sequence, without rendering
+        them. The compiler extends the successors of the sequence, so it is
+        compiled once."""
         for cfo in self.sequence:
             self.cfo = cfo
             self.__compile()
 
         return self.compiled_sequence
 
+    def render(self, record):
+        constraint = {"description": record.description()}
+        method = record.template.method
+        if SIGNAL in self.formats:
+            constraint[SIGNAL] = getattr(self.signal, method)(*record.elements)
+        if DECLARE in self.formats:
+            constraint[DECLARE] = getattr(self.declare, method)(*record.elements)
+        if LTLF in self.formats:
+            constraint[LTLF] = self.ltlf.template_to_ltl_str(
+                record.template.value, *record.activities()
+            )
+        return constraint
+
     def __compile(self):
         if self.__cfo_is_start():
             self.__create_init_constraint()
@@ -85,49 +123,24 @@ class Compiler:
                 continue
 
             if not successor.get("gateway successor"):
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{name} leads to {successor_name}",
-                        signal=self.signal.succession(name, successor_name),
-                        declare=self.declare.succession(name, successor_name),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.succession(name, successor_name)
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} leads to {}", Template.SUCCESSION, name, successor_name
                 )
 
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{name} and {successor_name}",
-                        signal=self.signal.co_existence(name, successor_name),
-                        declare=self.declare.co_existence(name, successor_name),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.co_existence(name, successor_name)
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} and {}", Template.CO_EXISTENCE, name, successor_name
                 )
 
                 if "is in gateway" not in self.cfo:
-                    self.compiled_sequence.append(
-                        self.__create_constraint_object(
-                            description=f"{name} or {successor_name}",
-                            signal=self.signal.choice(name, successor_name),
-                            declare=self.declare.choice(name, successor_name),
-                            ltlf=self.ltlf.to_ltl_str(
-                                self.declare.choice(name, successor_name)
-                            ),
-                        )
+                    self.__add_constraint(
+                        "{} or {}", Template.CHOICE, name, successor_name
                     )
 
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{name} leads to (with loops) {successor_name}",
-                        signal=self.signal.alternate_succession(name, successor_name),
-                        declare=self.declare.alternate_succession(name, successor_name),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.alternate_succession(name, successor_name)
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} leads to (with loops) {}",
+                    Template.ALTERNATE_SUCCESSION,
+                    name,
+                    successor_name,
                 )
 
     def __create_precedence_constraint(self):
@@ -155,35 +168,19 @@ class Compiler:
                 if not self.__is_valid_name(predecessor_name):
                     continue
 
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{predecessor_name} precedes {successor_name}",
-                        signal=self.signal.precedence(predecessor_name, successor_name),
-                        declare=self.declare.precedence(
-                            predecessor_name, successor_name
-                        ),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.precedence(predecessor_name, successor_name)
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} precedes {}",
+                    Template.PRECEDENCE,
+                    predecessor_name,
+                    successor_name,
                 )
 
                 if self.concurrent:
-                    self.compiled_sequence.append(
-                        self.__create_constraint_object(
-                            description=f"{predecessor_name} precedes {successor_name}",
-                            signal=self.signal.alternate_precedence(
-                                predecessor_name, successor_name
-                            ),
-                            declare=self.declare.alternate_precedence(
-                                predecessor_name, successor_name
-                            ),
-                            ltlf=self.ltlf.to_ltl_str(
-                                self.declare.alternate_precedence(
-                                    predecessor_name, successor_name
-                                )
-                            ),
-                        )
+                    self.__add_constraint(
+                        "{} precedes {}",
+                        Template.ALTERNATE_PRECEDENCE,
+                        predecessor_name,
+                        successor_name,
                     )
 
     def __is_valid_name(self, name):
@@ -267,32 +264,18 @@ class Compiler:
                 if self.__get_cfo_type(successor) in ALLOWED_GATEWAYS:
                     continue
 
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{predecessor_name} responds to {successor_name}",
-                        signal=self.signal.response(predecessor_name, successor_name),
-                        declare=self.declare.response(predecessor_name, successor_name),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.response(predecessor_name, successor_name)
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} responds to {}",
+                    Template.RESPONSE,
+                    predecessor_name,
+                    successor_name,
                 )
 
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{predecessor_name} responds to {successor_name}",
-                        signal=self.signal.alternate_response(
-                            predecessor_name, successor_name
-                        ),
-                        declare=self.declare.alternate_response(
-                            predecessor_name, successor_name
-                        ),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.alternate_response(
-                                predecessor_name, successor_name
-                            )
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} responds to {}",
+                    Template.ALTERNATE_RESPONSE,
+                    predecessor_name,
+                    successor_name,
                 )
 
     def __create_init_constraint(self):
@@ -300,14 +283,7 @@ class Compiler:
             self.cfo.update({"discard": True})
 
         name = self.__get_cfo_name()
-        self.compiled_sequence.append(
-            self.__create_constraint_object(
-                description=f"starts with {name}",
-                signal=self.signal.init(name),
-                declare=self.declare.init(name),
-                ltlf=self.ltlf.to_ltl_str(self.declare.init(name)),
-            )
-        )
+        self.__add_constraint("starts with {}", Template.INIT, name)
 
     def __create_end_constraint(self):
         name = self.__get_cfo_name()
@@ -315,14 +291,7 @@ class Compiler:
         if not self.__is_valid_name(name):
             return
 
-        self.compiled_sequence.append(
-            self.__create_constraint_object(
-                description=f"ends with {name}",
-                signal=self.signal.end(name),
-                declare=self.declare.end(name),
-                ltlf=self.ltlf.to_ltl_str(self.declare.end(name)),
-            )
-        )
+        self.__add_constraint("ends with {}", Template.END, name)
 
     def __create_exclusive_choice_constraint(self):
         successors = self.__get_cfo_successors()
@@ -338,26 +307,10 @@ class Compiler:
                     split[1]
                 ):
                     continue
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{split[0]} xor {split[1]}",
-                        signal=self.signal.exclusive_choice(split[0], split[1]),
-                        declare=self.declare.exclusive_choice(split[0], split[1]),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.exclusive_choice(split[0], split[1])
-                        ),
-                    )
-                )
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{split[0]} or {split[1]}",
-                        signal=self.signal.choice(split[0], split[1]),
-                        declare=self.declare.choice(split[0], split[1]),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.choice(split[0], split[1])
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} xor {}", Template.EXCLUSIVE_CHOICE, split[0], split[1]
                 )
+                self.__add_constraint("{} or {}", Template.CHOICE, split[0], split[1])
 
                 predecessors = self.__get_cfo_predecessors()
                 if predecessors:
@@ -368,19 +321,8 @@ class Compiler:
                                 predecessor_name
                             ) or not self.__is_valid_name(successor):
                                 continue
-                            self.compiled_sequence.append(
-                                self.__create_constraint_object(
-                                    description=f"{predecessor_name} or {successor}",
-                                    signal=self.signal.choice(
-                                        predecessor_name, successor
-                                    ),
-                                    declare=self.declare.choice(
-                                        predecessor_name, successor
-                                    ),
-                                    ltlf=self.ltlf.to_ltl_str(
-                                        self.declare.choice(predecessor_name, successor)
-                                    ),
-                                )
+                            self.__add_constraint(
+                                "{} or {}", Template.CHOICE, predecessor_name, successor
                             )
 
     def __create_parallel_gateway_constraint(self):
@@ -397,15 +339,8 @@ class Compiler:
                     split[1]
                 ):
                     continue
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{split[0]} and {split[1]}",
-                        signal=self.signal.co_existence(split[0], split[1]),
-                        declare=self.declare.co_existence(split[0], split[1]),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.co_existence(split[0], split[1])
-                        ),
-                    )
+                self.__add_constraint(
+                    "{} and {}", Template.CO_EXISTENCE, split[0], split[1]
                 )
 
     def __create_inclusive_choice_constraint(self):
@@ -422,16 +357,7 @@ class Compiler:
                     split[1]
                 ):
                     continue
-                self.compiled_sequence.append(
-                    self.__create_constraint_object(
-                        description=f"{split[0]} or {split[1]}",
-                        signal=self.signal.choice(split[0], split[1]),
-                        declare=self.declare.choice(split[0], split[1]),
-                        ltlf=self.ltlf.to_ltl_str(
-                            self.declare.choice(split[0], split[1])
-                        ),
-                    )
-                )
+                self.__add_constraint("{} or {}", Template.CHOICE, split[0], split[1])
 
             predecessors = self.__get_cfo_predecessors()
             if predecessors:
@@ -442,17 +368,8 @@ class Compiler:
                             predecessor_name
                         ) or not self.__is_valid_name(successor):
                             continue
-                        self.compiled_sequence.append(
-                            self.__create_constraint_object(
-                                description=f"{predecessor_name} or {successor}",
-                                signal=self.signal.choice(predecessor_name, successor),
-                                declare=self.declare.choice(
-                                    predecessor_name, successor
-                                ),
-                                ltlf=self.ltlf.to_ltl_str(
-                                    self.declare.choice(predecessor_name, successor)
-                                ),
-                            )
+                        self.__add_constraint(
+                            "{} or {}", Template.CHOICE, predecessor_name, successor
                         )
 
     def __get_cfo_name(self, cfo=None):
@@ -485,10 +402,5 @@ class Compiler:
             return cfo_type in ALLOWED_GATEWAYS
         return False
 
-    def __create_constraint_object(self, description, signal, declare, ltlf):
-        return {
-            "description": description,
-            "SIGNAL": signal,
-            "DECLARE": declare,
-            "LTLf": ltlf,
-        }
+    def __add_constraint(self, pattern, template, *elements):
+        self.compiled_sequence.append(ConstraintRecord(pattern, template, *elements))
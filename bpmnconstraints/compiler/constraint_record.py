@@ -0,0 +1,55 @@
+import sys
+from enum import Enum
+from bpmnconstraints.utils.constants import DECLARE_GATEWAYS
+
+
+class Template(Enum):
+    """Declare templates emitted by the compiler. The value is the Declare
+    name of the template."""
+
+    INIT = "Init"
+    END = "End"
+    PRECEDENCE = "Precedence"
+    ALTERNATE_PRECEDENCE = "Alternate Precedence"
+    CHAIN_PRECEDENCE = "Chain Precedence"
+    RESPONSE = "Response"
+    ALTERNATE_RESPONSE = "Alternate Response"
+    CHAIN_RESPONSE = "Chain Response"
+    SUCCESSION = "Succession"
+    ALTERNATE_SUCCESSION = "Alternate Succession"
+    CHAIN_SUCCESSION = "Chain Succession"
+    CHOICE = "Choice"
+    EXCLUSIVE_CHOICE = "Exclusive Choice"
+    CO_EXISTENCE = "Co-Existence"
+
+    @property
+    def method(self):
+        """Name of the method rendering the template in Declare and Signal."""
+        return self.name.lower()
+
+    @property
+    def symmetric(self):
+        return self.value in DECLARE_GATEWAYS
+
+
+class ConstraintRecord:
+    """Constraint emitted by the compiler, rendered to text only on output.
+    The description is a format pattern shared between constraints, and the
+    elements are interned names in the order of the template methods."""
+
+    __slots__ = ("pattern", "template", "elements")
+
+    def __init__(self, pattern, template, *elements) -> None:
+        self.pattern = pattern
+        self.template = template
+        self.elements = tuple(sys.intern(element) for element in elements)
+
+    def description(self):
+        return self.pattern.format(*self.elements)
+
+    def activities(self):
+        """Returns the elements in the order of the Declare constraint, which
+        lists the elements of symmetric templates in reverse."""
+        if self.template.symmetric:
+            return self.elements[::-1]
+        return self.elements
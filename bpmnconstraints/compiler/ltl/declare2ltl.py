@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from pylogics.syntax.base import And, Implies, Not, Or
 from pylogics.syntax.ltl import (
     Always,
@@ -10,6 +11,11 @@ from pylogics.syntax.ltl import (
 )
 from pylogics.utils.to_string import to_string
 
+# Number of translations and atoms kept by the process-wide caches.
+LTL_CACHE_SIZE = 2**15
+
+NOT_TRANSLATABLE = "Not translatable"
+
 # Declare Templates
 
 EXISTENCE = "Existence"
@@ -45,218 +51,281 @@ NOT_SUCCESSION = "Not Succession"
 NOT_ALTERNATE_SUCCESSION = "Not Alternate Succession"
 NOT_CHAIN_SUCCESSION = "Not Chain Succession"
 
+TEMPLATES = [
+    EXISTENCE,
+    ABSENCE,
+    EXACTLY,
+    INIT,
+    END,
+    CHOICE,
+    EXCLUSIVE_CHOICE,
+    RESPONDED_EXISTENCE,
+    RESPONSE,
+    ALTERNATE_RESPONSE,
+    CHAIN_RESPONSE,
+    PRECEDENCE,
+    ALTERNATE_PRECEDENCE,
+    CHAIN_PRECEDENCE,
+    SUCCESSION,
+    ALTERNATE_SUCCESSION,
+    CHAIN_SUCCESSION,
+    CO_EXISTENCE,
+    NOT_CO_EXISTENCE,
+    NOT_RESPONDED_EXISTENCE,
+    NOT_RESPONSE,
+    NOT_CHAIN_RESPONSE,
+    NOT_PRECEDENCE,
+    NOT_CHAIN_PRECEDENCE,
+    NOT_SUCCESSION,
+    NOT_ALTERNATE_SUCCESSION,
+    NOT_CHAIN_SUCCESSION,
+]
+
+# Atoms standing for the activities in the skeletons of the templates, and
+# for nested formulas in the skeletons of Existence, Absence and Exactly.
+LEFT_PLACEHOLDER = "__left__"
+RIGHT_PLACEHOLDER = "__right__"
+INNER_PLACEHOLDER = "__inner__"
+
+COUNTING_TEMPLATES = [EXISTENCE, ABSENCE, EXACTLY]
+
 
 class Declare2ltl:
+    """Translates Declare constraints to LTLf formulas. Composite templates
+    are built from the formulas of their parts. Translations to strings and
+    atoms are kept in bounded caches shared by all translators of the
+    process."""
+
     def __init__(self) -> None:
         pass
 
+    @staticmethod
+    def cache_info():
+        """Returns the hits, misses and size of the translation cache."""
+        return _translate.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        """Clears the translations, and the skeletons of the templates."""
+        _translate.cache_clear()
+        _skeleton.cache_clear()
+        _occurrences_skeleton.cache_clear()
+
     def to_ltl_str(self, constraint_str):
         try:
-            formula = self.__to_ltl(constraint_str)
-            if formula is None:
-                return "Not translatable"
-            return to_string(formula)
+            template, activities, n = self.__parse(constraint_str)
         except Exception:
             logging.error(constraint_str)
-            return "Not translatable"
+            return NOT_TRANSLATABLE
+        if not activities:
+            return NOT_TRANSLATABLE
+        return self.template_to_ltl_str(template, *activities, n=n)
+
+    def template_to_ltl_str(self, template, activity_left, activity_right=None, n=0):
+        """Translates a constraint given by its template name, activities and
+        cardinality, as to_ltl_str translates its Declare string."""
+        return _translate(template, activity_left, activity_right, n)
 
-    def __to_ltl(self, constraint_str):
+    def __parse(self, constraint_str):
         n = 0
-        templ_str = constraint_str.split("[")[0]
-        if templ_str[-1].isdigit():
-            n = int(templ_str[-1])
-            templ_str = templ_str[:-1]
+        template = constraint_str.split("[")[0]
+        if template[-1].isdigit():
+            cardinality = template[len(template.rstrip("0123456789")) :]
+            n = int(cardinality)
+            template = template[: -len(cardinality)]
         activities = [
             act.strip() for act in constraint_str.split("[")[1].split("]")[0].split(",")
         ]
         activities = [act for act in activities if act != ""]
-        if len(activities) == 0:
-            return None
-        activity_left = Atomic(activities[0].replace(" ", "_"))
-        activity_right = None
-        if len(activities) == 2:
-            activity_right = Atomic(activities[1].replace(" ", "_"))
-        if templ_str == ABSENCE:
-            if n == 1:
-                return Not(Eventually(activity_left))
-            elif n == 2:
-                return Not(
-                    Eventually(And(activity_left, Next(Eventually(activity_left))))
-                )
-            elif n == 3:
-                return Not(
-                    Eventually(
-                        And(
-                            activity_left,
-                            Next(
-                                Eventually(
-                                    And(activity_left, Next(Eventually(activity_left)))
-                                )
-                            ),
-                        )
-                    )
-                )
-            elif n == 4:
-                return Not(
-                    Eventually(
-                        And(
-                            activity_left,
-                            Next(
-                                Eventually(
-                                    And(
-                                        activity_left,
-                                        Next(
-                                            Eventually(
-                                                And(
-                                                    activity_left,
-                                                    Next(Eventually(activity_left)),
-                                                )
-                                            )
-                                        ),
-                                    )
-                                )
-                            ),
-                        )
-                    )
-                )
-            else:
-                raise ValueError("Unsupported n: " + str(n))
-
-        elif templ_str == EXISTENCE:
-            if n == 1:
-                return Eventually(activity_left)
-            elif n == 2:
-                return Eventually(And(activity_left, Next(Eventually(activity_left))))
-            elif n == 3:
-                return Eventually(
-                    And(
-                        activity_left,
-                        Next(
-                            Eventually(
-                                And(activity_left, Next(Eventually(activity_left)))
-                            )
-                        ),
-                    )
-                )
-            else:
-                raise ValueError("Unsupported n: " + str(n))
-
-        elif templ_str == EXACTLY:
-            if n == 1:
-                return And(
-                    self.__to_ltl(constraint_str.replace(EXACTLY, EXISTENCE)),
-                    self.__to_ltl(constraint_str.replace(EXACTLY + "1", ABSENCE + "2")),
-                )
-            elif n == 2:
-                return And(
-                    self.__to_ltl(constraint_str.replace(EXACTLY, EXISTENCE)),
-                    self.__to_ltl(constraint_str.replace(EXACTLY + "2", ABSENCE + "3")),
-                )
-            elif n == 3:
-                return And(
-                    self.__to_ltl(constraint_str.replace(EXACTLY, EXISTENCE)),
-                    self.__to_ltl(constraint_str.replace(EXACTLY + "3", ABSENCE + "4")),
-                )
-            else:
-                raise ValueError("Unsupported n: " + str(n))
-
-        elif templ_str == INIT:
-            return activity_left
-
-        elif templ_str == END:
-            return Eventually(And(activity_left, Next(Not(PropositionalTrue()))))
-
-        elif templ_str == CHOICE:
-            return Or(Eventually(activity_left), Eventually(activity_right))
-
-        elif templ_str == EXCLUSIVE_CHOICE:
-            return And(
-                Or(Eventually(activity_left), Eventually(activity_right)),
-                Not(And(Eventually(activity_left), Eventually(activity_right))),
-            )
+        if len(activities) != 2:
+            activities = activities[:1]
+        return template, activities, n
 
-        elif templ_str == RESPONDED_EXISTENCE:
-            return Implies(Eventually(activity_left), Eventually(activity_right))
+    def to_ltl(self, template, activity_left, activity_right=None, n=0):
+        """Returns the LTLf formula of a Declare template over activity names.
+        The cardinality n is read by Existence, Absence and Exactly."""
+        left = _atom(activity_left)
+        right = _atom(activity_right)
+        return self.__formula(template, left, right, n)
 
-        elif templ_str == RESPONSE:
-            return Always(Implies(activity_left, Eventually(activity_right)))
+    def __formula(self, template, left, right, n):
+        if template == ABSENCE:
+            return self.__absence(left, n)
 
-        elif templ_str == ALTERNATE_RESPONSE:
-            return Always(
-                Implies(activity_left, Next(Until(Not(activity_left), activity_right)))
-            )
+        elif template == EXISTENCE:
+            return self.__existence(left, n)
 
-        elif templ_str == CHAIN_RESPONSE:
-            return Always(Implies(activity_left, Next(activity_right)))
+        elif template == EXACTLY:
+            return And(self.__existence(left, n), self.__absence(left, n + 1))
 
-        elif templ_str == PRECEDENCE:
-            return Or(
-                Until(Not(activity_right), activity_left), Always(Not(activity_right))
-            )
-        elif templ_str == ALTERNATE_PRECEDENCE:
+        elif template == INIT:
+            return left
+
+        elif template == END:
+            return Eventually(And(left, Next(Not(PropositionalTrue()))))
+
+        elif template == CHOICE:
+            return Or(Eventually(left), Eventually(right))
+
+        elif template == EXCLUSIVE_CHOICE:
             return And(
-                Or(
-                    Until(Not(activity_right), activity_left),
-                    Always(Not(activity_right)),
-                ),
-                Always(
-                    Implies(
-                        activity_right,
-                        Or(
-                            Until(Not(activity_right), activity_left),
-                            Always(Not(activity_right)),
-                        ),
-                    )
-                ),
+                Or(Eventually(left), Eventually(right)),
+                Not(And(Eventually(left), Eventually(right))),
             )
 
-        elif templ_str == CHAIN_PRECEDENCE:
-            return Always(Implies(Next(activity_right), activity_left))
+        elif template == RESPONDED_EXISTENCE:
+            return Implies(Eventually(left), Eventually(right))
+
+        elif template == RESPONSE:
+            return Always(Implies(left, Eventually(right)))
+
+        elif template == ALTERNATE_RESPONSE:
+            return Always(Implies(left, Next(Until(Not(left), right))))
+
+        elif template == CHAIN_RESPONSE:
+            return Always(Implies(left, Next(right)))
+
+        elif template == PRECEDENCE:
+            return Or(Until(Not(right), left), Always(Not(right)))
+
+        elif template == ALTERNATE_PRECEDENCE:
+            precedence = self.__formula(PRECEDENCE, left, right, n)
+            return And(precedence, Always(Implies(right, precedence)))
+
+        elif template == CHAIN_PRECEDENCE:
+            return Always(Implies(Next(right), left))
 
-        elif templ_str == SUCCESSION:
+        elif template == SUCCESSION:
             return And(
-                self.__to_ltl(constraint_str.replace(SUCCESSION, RESPONSE)),
-                self.__to_ltl(constraint_str.replace(SUCCESSION, PRECEDENCE)),
+                self.__formula(RESPONSE, left, right, n),
+                self.__formula(PRECEDENCE, left, right, n),
             )
 
-        elif templ_str == ALTERNATE_SUCCESSION:
+        elif template == ALTERNATE_SUCCESSION:
             return And(
-                self.__to_ltl(
-                    constraint_str.replace(ALTERNATE_SUCCESSION, ALTERNATE_RESPONSE)
-                ),
-                self.__to_ltl(
-                    constraint_str.replace(ALTERNATE_SUCCESSION, ALTERNATE_PRECEDENCE)
-                ),
+                self.__formula(ALTERNATE_RESPONSE, left, right, n),
+                self.__formula(ALTERNATE_PRECEDENCE, left, right, n),
             )
 
-        elif templ_str == CHAIN_SUCCESSION:
+        elif template == CHAIN_SUCCESSION:
             return And(
-                self.__to_ltl(constraint_str.replace(CHAIN_SUCCESSION, CHAIN_RESPONSE)),
-                self.__to_ltl(
-                    constraint_str.replace(CHAIN_SUCCESSION, CHAIN_PRECEDENCE)
-                ),
+                self.__formula(CHAIN_RESPONSE, left, right, n),
+                self.__formula(CHAIN_PRECEDENCE, left, right, n),
             )
 
-        elif templ_str == CO_EXISTENCE:
+        elif template == CO_EXISTENCE:
             return And(
-                Implies(Eventually(activity_left), Eventually(activity_right)),
-                Implies(Eventually(activity_right), Eventually(activity_left)),
+                Implies(Eventually(left), Eventually(right)),
+                Implies(Eventually(right), Eventually(left)),
             )
 
-        elif templ_str == NOT_RESPONDED_EXISTENCE:
-            return Implies(Eventually(activity_left), Not(Eventually(activity_right)))
-        elif templ_str == NOT_CHAIN_PRECEDENCE:
-            return Always(Implies(Next(activity_right), Not(activity_left)))
-        elif templ_str == NOT_PRECEDENCE:
-            return Always(Implies(Eventually(activity_left), Not(activity_left)))
-        elif templ_str == NOT_RESPONSE:
-            return Always(Implies(activity_left, Not(Eventually(activity_right))))
-        elif templ_str == NOT_CHAIN_RESPONSE:
-            return Always(Implies(Next(activity_left), Not(activity_right)))
-        elif templ_str == NOT_SUCCESSION:
+        elif template == NOT_RESPONDED_EXISTENCE:
+            return Implies(Eventually(left), Not(Eventually(right)))
+        elif template == NOT_CHAIN_PRECEDENCE:
+            return Always(Implies(Next(right), Not(left)))
+        elif template == NOT_PRECEDENCE:
+            return Always(Implies(Eventually(left), Not(left)))
+        elif template == NOT_RESPONSE:
+            return Always(Implies(left, Not(Eventually(right))))
+        elif template == NOT_CHAIN_RESPONSE:
+            return Always(Implies(Next(left), Not(right)))
+        elif template == NOT_SUCCESSION:
             return And(
-                self.__to_ltl(constraint_str.replace(NOT_SUCCESSION, NOT_RESPONSE)),
-                self.__to_ltl(constraint_str.replace(NOT_SUCCESSION, NOT_PRECEDENCE)),
+                self.__formula(NOT_RESPONSE, left, right, n),
+                self.__formula(NOT_PRECEDENCE, left, right, n),
             )
         else:
-            raise ValueError("Unknown template: " + constraint_str)
+            raise ValueError("Unknown template: " + template)
+
+    def __occurrences(self, activity, n):
+        """Returns the formula of at least n occurrences of an activity, for
+        any n of at least one."""
+        if n < 1:
+            raise ValueError("Unsupported n: " + str(n))
+        formula = Eventually(activity)
+        for _ in range(n - 1):
+            formula = Eventually(And(activity, Next(formula)))
+        return formula
+
+    def __existence(self, activity, n):
+        return self.__occurrences(activity, n)
+
+    def __absence(self, activity, n):
+        return Not(self.__occurrences(activity, n))
+
+
+@lru_cache(maxsize=LTL_CACHE_SIZE)
+def _atom(activity):
+    if activity is None:
+        return None
+    return Atomic(activity.strip().replace(" ", "_"))
+
+
+def _pattern(formula):
+    """Renders a formula over the placeholder atoms as a format string over
+    the names of the left and right atoms."""
+    skeleton = to_string(formula).replace("{", "{{").replace("}", "}}")
+    return skeleton.replace(LEFT_PLACEHOLDER, "{0}").replace(RIGHT_PLACEHOLDER, "{1}")
+
+
+@lru_cache(maxsize=1024)
+def _skeleton(template, n):
+    """Renders a template once over the placeholder atoms. Existence, Absence
+    and Exactly are built for any n without pylogics."""
+    if template in COUNTING_TEMPLATES:
+        return _counting_skeleton(template, n)
+    formula = _TRANSLATOR.to_ltl(template, LEFT_PLACEHOLDER, RIGHT_PLACEHOLDER, n)
+    return _pattern(formula)
+
+
+@lru_cache(maxsize=1024)
+def _occurrences_skeleton(n):
+    """Returns the skeleton of at least n occurrences of the left activity.
+    Each further occurrence wraps the skeleton in the same prefix and suffix,
+    so the skeleton is built in time linear in n."""
+    if n < 1:
+        raise ValueError("Unsupported n: " + str(n))
+    prefix, suffix = _OCCURRENCE_STEP
+    return prefix * (n - 1) + _OCCURRENCE + suffix * (n - 1)
+
+
+def _counting_skeleton(template, n):
+    if template == EXISTENCE:
+        return _occurrences_skeleton(n)
+    if template == EXACTLY:
+        absence = _NOT.replace(INNER_PLACEHOLDER, _occurrences_skeleton(n + 1))
+        return _AND.format(_occurrences_skeleton(n), absence)
+    return _NOT.replace(INNER_PLACEHOLDER, _occurrences_skeleton(n))
+
+
+@lru_cache(maxsize=LTL_CACHE_SIZE)
+def _translate(template, activity_left, activity_right, n):
+    """Translates a constraint by formatting the skeleton of its template with
+    the validated atoms. pylogics simplifies formulas over equal atoms, and
+    fails on a missing atom, so these cases are translated through it."""
+    try:
+        left = _atom(activity_left)
+        right = _atom(activity_right)
+        skeleton = _skeleton(template, n)
+        if "{1}" in skeleton and (right is None or left == right):
+            return to_string(
+                _TRANSLATOR.to_ltl(template, activity_left, activity_right, n)
+            )
+        return skeleton.format(left.name, right.name if right else None)
+    except Exception:
+        logging.error(f"{template}{n or ''}[{activity_left}, {activity_right}]")
+        return NOT_TRANSLATABLE
+
+
+_TRANSLATOR = Declare2ltl()
+
+_LEFT = Atomic(LEFT_PLACEHOLDER)
+_INNER = Atomic(INNER_PLACEHOLDER)
+_OCCURRENCE = _pattern(Eventually(_LEFT))
+_OCCURRENCE_STEP = tuple(
+    _pattern(Eventually(And(_LEFT, Next(_INNER)))).split(INNER_PLACEHOLDER)
+)
+_NOT = _pattern(Not(_INNER))
+_AND = _pattern(And(_INNER, Atomic(RIGHT_PLACEHOLDER))).replace(
+    INNER_PLACEHOLDER, "{0}"
+)
@@ -1,22 +1,30 @@
 import logging
 from pathlib import Path
 from json import load, JSONDecodeError
-from xml.etree import ElementTree
 from bpmnconstraints.utils.constants import *
 from bpmnconstraints.utils.sanitizer import Sanitizer
-from bpmnconstraints.parser.json_model import JsonModel
-from bpmnconstraints.parser.xml_model import XmlModel
+from bpmnconstraints.parser.json_model import JsonModel, CompactJsonModel
+from bpmnconstraints.parser.xml_model import XmlModel, iterparse_bpmn
+from bpmnconstraints.parser.model_stats import ModelStats
 
 
 class Parser:
-    def __init__(self, bpmn, is_file, transitivity) -> None:
+    def __init__(self, bpmn, is_file, transitivity, compact=False) -> None:
         self.transitivity = transitivity
+        # A model loaded from a file is only held by the parser, so its raw
+        # JSON can always be replaced by compact records.
+        self.compact = compact or is_file
         self.bpmn_model = self.__create_model(bpmn, is_file)
         self.bpmn_diagram = self.bpmn_model
         self.sequence = []
-        self.is_json = is_file and Path(bpmn).suffix == ".json"
+        self.is_json = isinstance(self.bpmn_model, dict)
         self.sanitizer = Sanitizer()
         self.model = None
+        self.elements_by_id = {}
+        self.cfos_by_id = {}
+        self.successors_by_id = {}
+        self.predecessors_by_id = {}
+        self.stats = ModelStats()
 
     def __flatten_model(self):
         self.bpmn_model[CHILD_SHAPES] = self.__flatten(self.bpmn_model)
@@ -28,7 +36,7 @@ class Parser:
                 if not file_extension or file_extension not in [".json", ".xml"]:
                     return None
                 elif file_extension == ".xml":
-                    return ElementTree.parse(bpmn).getroot()
+                    return iterparse_bpmn(bpmn)
                 elif file_extension == ".json":
                     with open(bpmn, "r", encoding="utf-8") as file:
                         return load(file)
@@ -42,9 +50,12 @@ class Parser:
     def __flatten(self, model):
         elements = []
         for elem in model[CHILD_SHAPES]:
-            if self.model.get_element_type(elem) not in ALLOWED_SWIMLANES:
+            elem_type = self.model.get_element_type(elem)
+            if elem_type not in ALLOWED_SWIMLANES:
                 elements.append(elem)
             else:
+                if elem_type == POOL:
+                    self.stats.add_pool()
                 elements += self.__flatten(elem)
         return elements
 
@@ -53,9 +64,17 @@ class Parser:
             if self.is_json:
                 self.model = JsonModel(self.bpmn_model)
                 self.__flatten_model()
+                if self.compact:
+                    self.model = CompactJsonModel(self.bpmn_model)
+                    self.bpmn_model = self.model.model
+                    self.bpmn_diagram = self.bpmn_model
             else:
                 self.model = XmlModel(self.bpmn_model)
+                for _ in range(self.model.count_processes()):
+                    self.stats.add_pool()
 
+            self.__index_elements()
+            self.__build_adjacency()
             self.__parse()
             self.__mark_gateway_elements()
             if self.transitivity:
@@ -106,54 +125,118 @@ class Parser:
                         cfo.update({"is in gateway": True})
 
     def __get_cfo_by_id(self, successor_id):
-        for cfo in self.sequence:
-            if successor_id == cfo.get("id"):
-                return cfo
+        return self.cfos_by_id.get(successor_id)
 
     def __get_parsed_cfo_by_bpmn_element(self, elem):
-        elem_id = self.model.get_id(elem)
-        for parsed_cfo in self.sequence:
-            if parsed_cfo.get("id") == elem_id:
-                return parsed_cfo
-
-    def __find_transitive_closure(self, cfo, transitivity, visited):
-        # Check if the current node has already been visited to prevent a loop
-        if cfo.get("id") in visited:
-            print(f"Already visited {cfo.get('id')}, skipping to avoid a loop.")
-            return
-
-        # Mark the current node as visited
-        visited.add(cfo.get("id"))
-
-        if cfo:
-            for successor in cfo.get("successor"):
-                successor_id = successor.get("id")
-
-                successor = self.__get_cfo_by_id(successor_id)
-                if successor:
-                    if "is in gateway" not in successor:
-                        transitivity.append(successor)
-                    for successor in cfo.get("successor"):
-                        successor_cfo = self.__get_cfo_by_id(successor.get("id"))
-                        self.__find_transitive_closure(
-                            successor_cfo, transitivity, visited
-                        )
+        return self.cfos_by_id.get(self.model.get_id(elem))
 
     def __add_transitivity(self):
-        for cfo in self.sequence:
+        """Adds the CFOs that are reachable from each CFO, computed once for the
+        whole graph. Loops are condensed into strongly connected components, and
+        the reachable sets are propagated between components as bitsets."""
+        indices = {}
+        for index, cfo in enumerate(self.sequence):
+            indices.setdefault(cfo.get("id"), index)
+
+        edges = [
+            [
+                indices[successor.get("id")]
+                for successor in cfo.get("successor")
+                if successor.get("id") in indices
+            ]
+            for cfo in self.sequence
+        ]
+        components, component_of = self.__strongly_connected_components(edges)
+
+        reachable = [0] * len(components)
+        for component_index, component in enumerate(components):
+            bits = 0
+            for node in component:
+                for successor in edges[node]:
+                    bits |= 1 << successor
+                    if component_of[successor] != component_index:
+                        bits |= reachable[component_of[successor]]
+            reachable[component_index] = bits
+
+        not_in_gateway = 0
+        for index, cfo in enumerate(self.sequence):
+            if "is in gateway" not in cfo:
+                not_in_gateway |= 1 << index
+
+        for index, cfo in enumerate(self.sequence):
+            bits = reachable[component_of[index]] & not_in_gateway
             transitivity = []
-
-            visited = set()  # Initialize the visited set for cycle detection
-            self.__find_transitive_closure(cfo, transitivity, visited)
+            while bits:
+                lowest = bits & -bits
+                transitivity.append(self.sequence[lowest.bit_length() - 1])
+                bits ^= lowest
 
             if transitivity:
                 cfo.update({"transitivity": transitivity})
 
+    def __strongly_connected_components(self, edges):
+        """Iterative version of Tarjan's algorithm. Components are returned in
+        reverse topological order, so a component is listed after every
+        component it can reach."""
+        order = [-1] * len(edges)
+        low = [0] * len(edges)
+        on_stack = [False] * len(edges)
+        component_of = [-1] * len(edges)
+        components = []
+        stack = []
+        counter = 0
+
+        for root in range(len(edges)):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(edges[root]))]
+
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if order[successor] == -1:
+                        order[successor] = low[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, iter(edges[successor])))
+                        break
+                    if on_stack[successor]:
+                        low[node] = min(low[node], order[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component_of[member] = len(components)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        return components, component_of
+
     def __parse(self):
         for elem in self.model.get_diagram_elements():
             cfo = self.__create_cfo(elem)
             if cfo:
                 self.sequence.append(cfo)
+        self.__index_cfos()
+
+    def __index_cfos(self):
+        """Maps each CFO ID to its CFO. The first CFO with a given ID wins."""
+        self.cfos_by_id = {}
+        for cfo in self.sequence:
+            self.cfos_by_id.setdefault(cfo.get("id"), cfo)
 
     def __create_cfo(self, elem):
         if self.__valid_cfo_element(elem):
@@ -235,7 +318,26 @@ class Parser:
         except KeyError:
             return False
 
+    def __build_adjacency(self):
+        """Resolves the outgoing sequence flows of every element once, and stores
+        the successors and predecessors of each element by its ID."""
+        self.successors_by_id = {}
+        self.predecessors_by_id = {}
+        for elem in self.model.get_diagram_elements():
+            successors = self.__resolve_successors(elem)
+            self.successors_by_id.setdefault(self.model.get_id(elem), successors)
+            for successor in successors:
+                self.predecessors_by_id.setdefault(
+                    self.model.get_id(successor), []
+                ).append(elem)
+
     def __get_successors(self, elem):
+        return self.successors_by_id.get(self.model.get_id(elem), [])
+
+    def __get_predecessors(self, elem):
+        return self.predecessors_by_id.get(self.model.get_id(elem), [])
+
+    def __resolve_successors(self, elem):
         try:
             connection_objects = self.model.get_outgoing_connection(elem)
             if len(connection_objects) == 0:
@@ -266,21 +368,6 @@ class Parser:
         except TypeError:
             raise Exception
 
-    def __get_predecessors(self, current_elem):
-        predecessors = []
-        current_elem_id = self.model.get_id(current_elem)
-        try:
-            for elem in self.model.get_diagram_elements():
-                successors = self.__get_successors(elem)
-                if successors:
-                    for successor in successors:
-                        if successor:
-                            if self.model.get_id(successor) == current_elem_id:
-                                predecessors.append(elem)
-        except Exception:
-            raise Exception
-        return predecessors
-
     def __format_list(self, elems, gateway=False):
         formatted = []
         for elem in elems:
@@ -295,22 +382,25 @@ class Parser:
                     "is end": len(successors) == 0
                     or self.__is_successor_end_event(successors),
                 }
-
-                try:
-                    cfo.update({"splitting": len(self.__get_successors(elem)) >= 2})
-                except Exception:
-                    pass
                 formatted.append(cfo)
         return formatted
 
+    def __index_elements(self):
+        """Maps each element ID to its element, so that lookups do not need to
+        scan the whole diagram, and collects the model statistics.
+        The first element with a given ID wins."""
+        self.elements_by_id = {}
+        for elem in self.model.get_diagram_elements():
+            self.elements_by_id.setdefault(self.model.get_id(elem), elem)
+            self.stats.add_element(
+                self.model.get_element_type(elem),
+                self.model.get_outgoing_connection(elem),
+            )
+
     def __get_element_by_id(self, connection_id):
         try:
-            return next(
-                e
-                for e in self.model.get_diagram_elements()
-                if self.model.get_id(e) == connection_id
-            )
-        except StopIteration:
+            return self.elements_by_id[connection_id]
+        except KeyError:
             raise Exception(f"Could not find element with ID {connection_id}")
 
     def __get_activity_type(self, elem):
@@ -377,53 +467,25 @@ class Parser:
         return False
 
     def count_parsable_elements(self):
-        count = 0
-        for elem in self.model.get_diagram_elements():
-            elem_type = self.model.get_element_type(elem)
-            if elem_type in ALLOWED_ACTIVITIES or elem_type in ALLOWED_GATEWAYS:
-                count += 1
-        return count
+        return self.stats.parsable_elements
 
     def count_model_elements(self):
-        return len(self.bpmn_model[CHILD_SHAPES])
+        return self.stats.elements
 
     def count_model_element_types(self):
-        return len(self.get_element_types())
+        return len(self.stats.element_types)
 
     def count_pools(self):
-        count = 0
-        for elem in self.bpmn_diagram[CHILD_SHAPES]:
-            if self.model.get_element_type(elem) == "Pool":
-                count += 1
-        return count
+        return self.stats.pools
 
     def has_start(self):
         return any(elem.get("is start") for elem in self.sequence)
 
     def get_element_types(self):
-        elem_types = {}
-
-        for elem in self.model.get_diagram_elements():
-            elem_type = self.model.get_element_type(elem)
-
-            if elem_type in elem_types:
-                elem_types[elem_type] += 1
-            else:
-                elem_types[elem_type] = 1
-        return elem_types
+        return self.stats.element_types
 
     def contains_multiple_starts(self):
-        count = 0
-        for elem in self.model.get_diagram_elements():
-            if self.__is_element_start_event(elem):
-                count += 1
-        return count > 1
+        return self.stats.contains_multiple_starts()
 
     def or_multiple_paths(self):
-        for elem in self.model.get_diagram_elements():
-            if (
-                self.model.get_element_type(elem) == "InclusiveGateway"
-                and len(self.model.get_outgoing_connection(elem)) >= 3
-            ):
-                return True
-        return False
+        return self.stats.or_multiple_paths
@@ -25,3 +25,47 @@ class JsonModel:
 
     def get_id(self, elem):
         return elem[ELEMENT_ID]
+
+
+class ElementRecord:
+    """Compact projection of a child shape, holding only the fields the parser
+    reads. The name slot is left unset for shapes without a name."""
+
+    __slots__ = ("id", "type", "name", "outgoing")
+
+    def __init__(self, shape) -> None:
+        self.id = shape[ELEMENT_ID]
+        self.type = shape[STENCIL][ID].lower()
+        self.outgoing = [
+            connection[ELEMENT_ID] for connection in shape[OUTGOING] if connection
+        ]
+        properties = shape.get(PROPERTIES, {})
+        if NAME in properties:
+            self.name = properties[NAME]
+
+
+class CompactJsonModel(JsonModel):
+    """JSON model which projects each child shape once into an ElementRecord,
+    and keeps no reference to the original shapes."""
+
+    def __init__(self, model) -> None:
+        super().__init__(
+            {CHILD_SHAPES: [ElementRecord(shape) for shape in model[CHILD_SHAPES]]}
+        )
+
+    def get_element_type(self, elem):
+        return elem.type
+
+    def get_outgoing_connection(self, elem):
+        return elem.outgoing
+
+    def get_name(self, elem):
+        try:
+            return elem.name
+        except AttributeError:
+            raise KeyError(NAME)
+
+    def get_id(self, elem):
+        if isinstance(elem, str):
+            return elem
+        return elem.id
@@ -0,0 +1,146 @@
+from bpmnconstraints.utils.constants import *
+from bpmnconstraints.parser.json_model import JsonModel
+from bpmnconstraints.parser.xml_model import XmlModel
+
+
+class ModelStats:
+    """Statistics of a BPMN diagram, collected by the parser while it indexes
+    the diagram elements, or by scan_model before the diagram is parsed.
+    The start candidate flag is only set by scan_model."""
+
+    def __init__(self) -> None:
+        self.pools = 0
+        self.elements = 0
+        self.element_types = {}
+        self.parsable_elements = 0
+        self.start_events = 0
+        self.or_multiple_paths = False
+        self.has_start_candidate = False
+
+    def add_pool(self):
+        self.pools += 1
+
+    def add_element(self, elem_type, outgoing):
+        self.elements += 1
+        self.element_types[elem_type] = self.element_types.get(elem_type, 0) + 1
+
+        if elem_type in ALLOWED_ACTIVITIES or elem_type in ALLOWED_GATEWAYS:
+            self.parsable_elements += 1
+        if elem_type in ALLOWED_START_EVENTS:
+            self.start_events += 1
+        if elem_type == OR_GATEWAY and len(outgoing) >= 3:
+            self.or_multiple_paths = True
+
+    def contains_multiple_starts(self):
+        return self.start_events > 1
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, values):
+        stats = cls()
+        stats.__dict__.update(values)
+        return stats
+
+
+def scan_model(bpmn):
+    """Collects the statistics of a raw JSON or XML diagram in one linear scan,
+    without parsing it and without modifying it.
+
+    A diagram can only get a start element from the parser if it has a start
+    event, or a flow element which no sequence flow leads to. Diagrams without
+    a start candidate can therefore be discarded before they are parsed."""
+    stats = ModelStats()
+    if isinstance(bpmn, dict):
+        model = JsonModel(bpmn)
+        elements = _flatten(model, bpmn[CHILD_SHAPES], stats)
+    else:
+        model = XmlModel(bpmn)
+        for _ in range(model.count_processes()):
+            stats.add_pool()
+        elements = model.get_diagram_elements()
+
+    flow_targets = {}
+    referenced_flows = []
+    candidates = []
+    for elem in elements:
+        elem_type = model.get_element_type(elem)
+        outgoing = model.get_outgoing_connection(elem)
+        stats.add_element(elem_type, outgoing)
+
+        if elem_type in ALLOWED_CONNECTING_OBJECTS:
+            target = _first_connection(model, outgoing)
+            if target is not None:
+                flow_targets.setdefault(model.get_id(elem), target)
+            continue
+        if isinstance(outgoing, str):
+            outgoing = [outgoing]
+        for connection in outgoing:
+            if connection:
+                referenced_flows.append(_first_connection(model, connection))
+        if (
+            elem_type in ALLOWED_ACTIVITIES
+            or elem_type in ALLOWED_GATEWAYS
+            or elem_type in ALLOWED_END_EVENTS
+        ):
+            candidates.append(model.get_id(elem))
+
+    targets = {flow_targets.get(flow) for flow in referenced_flows}
+    stats.has_start_candidate = stats.start_events > 0 or any(
+        candidate not in targets for candidate in candidates
+    )
+    return stats
+
+
+def skip_model(stats):
+    """Filters out diagrams with several pools, without a start candidate or
+    with fewer than five elements."""
+    if stats.pools > 1:
+        return True
+
+    if not stats.has_start_candidate:
+        return True
+
+    if stats.elements < 5:
+        return True
+
+    return False
+
+
+def skip_compared_model(stats):
+    """Also filters out diagrams with multiple start events, or with an OR
+    gateway with many paths."""
+    if skip_model(stats):
+        return True
+
+    if stats.contains_multiple_starts():
+        return True
+
+    if stats.or_multiple_paths:
+        return True
+
+    return False
+
+
+def _flatten(model, shapes, stats):
+    elements = []
+    for elem in shapes:
+        elem_type = model.get_element_type(elem)
+        if elem_type not in ALLOWED_SWIMLANES:
+            elements.append(elem)
+        else:
+            if elem_type == POOL:
+                stats.add_pool()
+            elements += _flatten(model, elem[CHILD_SHAPES], stats)
+    return elements
+
+
+def _first_connection(model, connection):
+    if isinstance(connection, list):
+        if not connection:
+            return None
+        connection = connection[0]
+    if not connection:
+        return None
+    return model.get_id(connection)
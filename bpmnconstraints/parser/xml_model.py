@@ -1,8 +1,48 @@
-from bpmnconstraints.utils.constants import *
 from xml.etree import ElementTree
-import xmltodict as xtd
+from bpmnconstraints.utils.constants import *
+
+BPMN_NAMESPACE = "{http://www.omg.org/spec/BPMN/20100524/MODEL}"
+PROCESS_TAG = f"{BPMN_NAMESPACE}process"
+PROCESS_ELEMENT = f".//{PROCESS_TAG}"
+OUTGOING_ELEMENT = f"{BPMN_NAMESPACE}outgoing"
+EXTENSION_ELEMENTS = "extensionElements"
+EXTENSION_ELEMENTS_TAG = f"{BPMN_NAMESPACE}{EXTENSION_ELEMENTS}"
+ELEMENT_ATTRIBUTES = ["id", "name", "targetRef"]
+
 
-PROCESS_ELEMENT = ".//{http://www.omg.org/spec/BPMN/20100524/MODEL}process"
+def iterparse_bpmn(source):
+    """Streams a BPMN XML file and returns its root element, pruned to the flow
+    elements of each process and their outgoing references. Every other
+    subtree, such as the diagram interchange shapes and edges, is dropped
+    from the tree as soon as it has been read."""
+    root = None
+    open_elements = []
+
+    for event, elem in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            open_elements.append(elem)
+            continue
+
+        open_elements.pop()
+        if not open_elements:
+            break
+        parent = open_elements[-1]
+        grandparent = open_elements[-2] if len(open_elements) > 1 else None
+
+        if elem.tag == PROCESS_TAG:
+            continue
+        if parent.tag == PROCESS_TAG:
+            if elem.tag != EXTENSION_ELEMENTS_TAG:
+                continue
+        elif grandparent is not None and grandparent.tag == PROCESS_TAG:
+            if elem.tag == OUTGOING_ELEMENT:
+                continue
+
+        parent.remove(elem)
+
+    return root
 
 
 class XmlModel:
@@ -10,36 +50,39 @@ class XmlModel:
         self.root = model
         self.process_elements = self.root.find(PROCESS_ELEMENT)
         self.child_elements = self.process_elements.findall("./*")
+        self.elements = None
 
-    def __xml_to_dict(self, input_dict):
+    def __xml_to_dict(self, element):
         new_dict = {}
+        new_dict["type"] = element.tag.rpartition("}")[2]
         new_dict["outgoing"] = []
-        for tag_key in input_dict:
-            new_dict["type"] = tag_key.split(":")[1]
-            for key, value in input_dict[tag_key].items():
-                if key in ["ns0:extensionElements"]:
-                    continue
-                if key.startswith("@"):
-                    new_dict[key[1:]] = value
-                elif key.endswith(":outgoing"):
-                    if isinstance(value, list):
-                        new_dict["outgoing"].extend(value)
-                    else:
-                        new_dict["outgoing"].append(value)
-                else:
-                    new_dict[key] = value
+        for key in ELEMENT_ATTRIBUTES:
+            value = element.get(key)
+            if value is not None:
+                new_dict[key] = value
+        for outgoing in element.iterfind(OUTGOING_ELEMENT):
+            if outgoing.text and outgoing.text.strip():
+                new_dict["outgoing"].append(outgoing.text.strip())
         return new_dict
 
     def get_child_models(self):
+        """Converts the process children on first access. The converted elements
+        are cached, and shared by all later calls."""
+        if self.elements is not None:
+            return self.elements
+
         elements = []
 
         for child in self.child_elements:
-            xml_string = ElementTree.tostring(child, encoding="utf-8")
-            parsed_xml = self.__xml_to_dict(xtd.parse(xml_string))
-            if parsed_xml["type"] == "extensionElements":
+            parsed_xml = self.__xml_to_dict(child)
+            if parsed_xml["type"] == EXTENSION_ELEMENTS:
                 continue
             elements.append(parsed_xml)
-        return elements
+        self.elements = elements
+        return self.elements
+
+    def count_processes(self):
+        return len(self.root.findall(PROCESS_ELEMENT))
 
     def get_element_type(self, elem):
         return elem["type"].lower()
@@ -2,18 +2,23 @@
 
 # pylint: disable=import-error
 import argparse
+import glob
 import logging
 import sys
+from functools import partial
 from pathlib import Path
-from json import dumps
-from tqdm import tqdm
-from bpmnconstraints.parser.bpmn_parser import Parser
-from bpmnconstraints.compiler.bpmn_compiler import Compiler
-from bpmnconstraints.utils.script_utils import Setup
-from bpmnconstraints.mermaid.mermaidtranslation import Mermaid
-from bpmnconstraints.script_utils.constraint_comparison import ComparisonScript
-from bpmnconstraints.script_utils.dataset_parsing import ParserScript
-from bpmnconstraints.script_utils.dataset_compiling import CompilingScript
+from bpmnconstraints.utils.script_utils import Setup, map_in_order
+from bpmnconstraints.utils.output import OutputWriter
+from bpmnconstraints.utils.constants import (
+    CONSTRAINT_TYPES,
+    DIAGRAM_SUFFIXES,
+    OUTPUT_FORMATS,
+    ID,
+)
+
+# The modules behind each subcommand are imported where the subcommand runs,
+# so that a call only pays for the dependencies it uses. The dataset scripts
+# import pandas and matplotlib, and the compiler imports pylogics.
 
 logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
 
@@ -24,8 +29,18 @@ def run():
     """
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("--parse", type=str, help="Runs the parser")
-    parser.add_argument("--compile", type=str, help="Runs the compiler")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["serve"],
+        help="serve: reads compile requests as JSON lines from stdin",
+    )
+    parser.add_argument(
+        "--parse", type=str, help="Runs the parser on a file, directory or glob"
+    )
+    parser.add_argument(
+        "--compile", type=str, help="Runs the compiler on a file, directory or glob"
+    )
     parser.add_argument("--transitivity", type=bool, help="Adds transitivity")
     parser.add_argument("--compare_constraints")
     parser.add_argument("--dataset", type=str, help="Path to dataset to compile")
@@ -41,6 +56,29 @@ def run():
     parser.add_argument(
         "--skip_named_gateways", type=bool, help="Skips adding gateways as tokens."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used for batches and dataset parsing and compiling.",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        help="Path to a cache of compiled models, used when compiling.",
+    )
+    parser.add_argument(
+        "--output_format",
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Format of parsed models and constraints.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Path to a file to write parsed models and constraints to.",
+    )
     parser.add_argument(
         "--compile_to_mermaid",
         type=str,
@@ -48,31 +86,70 @@ def run():
     )
 
     args = parser.parse_args()
+    output = OutputWriter(args.output_format, args.output)
+    if args.output is None:
+        # Results go to stdout, so logging must not be mixed into them.
+        logging.basicConfig(stream=sys.stderr, level=logging.DEBUG, force=True)
+
+    if args.command == "serve":
+        from bpmnconstraints.script_utils.compile_server import CompileServer
+
+        logging.basicConfig(stream=sys.stderr, level=logging.WARNING, force=True)
+        CompileServer(sys.stdin, sys.stdout, workers=args.workers).run()
+
+    elif args.parse:
+        from bpmnconstraints.parser.bpmn_parser import Parser
 
-    if args.parse:
         path = Path(args.parse)
         setup = Setup(None)
         if setup.is_file(path):
             res = Parser(path, True, args.transitivity).run()
             if res:
-                print(dumps(res, indent=2))
+                with output:
+                    output.write(output_sequence(res))
+        else:
+            run_batch(
+                partial(parse_file, transitivity=args.transitivity),
+                batch_paths(args.parse),
+                args.workers,
+                output,
+            )
 
     elif args.compile:
-        if not args.constraint_type:
-            path = Path(args.compile)
-            setup = Setup(None)
-            if setup.is_file(path):
-                res = Parser(path, True, args.transitivity).run()
-                res = Compiler(res, args.transitivity, args.skip_named_gateways).run()
-                if res:
-                    print(dumps(res, indent=2))
+        if not Setup(None).is_file(Path(args.compile)):
+            run_batch(
+                partial(
+                    compile_file,
+                    transitivity=args.transitivity,
+                    skip_named_gateways=args.skip_named_gateways,
+                    constraint_type=args.constraint_type,
+                    cache_path=args.cache,
+                ),
+                batch_paths(args.compile),
+                args.workers,
+                output,
+            )
+        elif not args.constraint_type:
+            constraints = stream_diagram(
+                Path(args.compile),
+                args.transitivity,
+                args.skip_named_gateways,
+                args.cache,
+            )
+            with output:
+                output.write_items(constraints)
+        elif args.constraint_type not in CONSTRAINT_TYPES:
+            logging.warning(
+                "Unknown constraint type. Use 'SIGNAL', 'DECLARE' or 'LTLF'."
+            )
         else:
-            path = Path(args.compile)
-            res = compile_bpmn_diagram(
-                path, args.constraint_type, args.skip_named_gateways
+            key = CONSTRAINT_TYPES[args.constraint_type]
+            logging.info(f"Generating {args.constraint_type} constraints...")
+            constraints = stream_diagram(
+                Path(args.compile), True, args.skip_named_gateways, args.cache, {key}
             )
-            if res:
-                print(dumps(res, indent=2))
+            with output:
+                output.write_items(constraint.get(key) for constraint in constraints)
 
     elif args.compare_constraints:
         dataframe_path = None
@@ -89,7 +166,13 @@ def run():
             return
 
         if setup.is_file(dataframe_path) and setup.is_file(dataset_path):
-            script = ComparisonScript(dataset_path, dataframe_path, plot)
+            from bpmnconstraints.script_utils.constraint_comparison import (
+                ComparisonScript,
+            )
+
+            script = ComparisonScript(
+                dataset_path, dataframe_path, plot, cache_path=args.cache
+            )
             script.run()
 
     elif args.parse_dataset:
@@ -101,7 +184,9 @@ def run():
             return
 
         if setup.is_directory(dataset_path):
-            script = ParserScript(dataset_path, plot)
+            from bpmnconstraints.script_utils.dataset_parsing import ParserScript
+
+            script = ParserScript(dataset_path, plot, workers=args.workers)
             script.run()
 
     elif args.compile_dataset:
@@ -112,10 +197,26 @@ def run():
         if dataset_path is None:
             return
         if setup.is_directory(dataset_path):
-            script = CompilingScript(dataset_path, True, False)
+            from bpmnconstraints.script_utils.dataset_compiling import (
+                CompilingScript,
+            )
+
+            script = CompilingScript(
+                dataset_path,
+                True,
+                args.output is not None,
+                workers=args.workers,
+                skip_named_gateways=args.skip_named_gateways,
+                cache_path=args.cache,
+                output_format=args.output_format,
+                output_path=args.output,
+            )
             script.run()
 
     elif args.compile_to_mermaid:
+        from bpmnconstraints.parser.bpmn_parser import Parser
+        from bpmnconstraints.mermaid.mermaidtranslation import Mermaid
+
         path = Path(args.compile_to_mermaid)
         setup = Setup(None)
         if setup.is_file(path):
@@ -128,13 +229,155 @@ def run():
         parser.print_help()
 
 
-def compile_bpmn_diagram(path_to_bpmn_diagram, constraint_type, skip_named_gateways):
+def batch_paths(pattern):
+    """Returns the diagram files in a directory, or matching a glob pattern,
+    in sorted order."""
+    path = Path(pattern)
+    if path.is_dir():
+        paths = path.iterdir()
+    elif glob.has_magic(pattern):
+        paths = (Path(match) for match in glob.iglob(pattern, recursive=True))
+    else:
+        return []
+    return sorted(
+        path for path in paths if path.is_file() and path.suffix in DIAGRAM_SUFFIXES
+    )
+
+
+def run_batch(function, paths, workers, output):
+    """Writes one record per file as soon as it is processed, in the order of
+    the paths. Logging goes to stderr, so that stdout only holds records."""
+    logging.basicConfig(stream=sys.stderr, level=logging.WARNING, force=True)
+    with output:
+        for line in map_in_order(function, paths, workers):
+            try:
+                output.write_record(line)
+            except ValueError as error:
+                output.write_record({"path": line["path"], "error": str(error)})
+
+
+def parse_file(path, transitivity):
+    """Parses one file of a batch."""
+    from bpmnconstraints.parser.bpmn_parser import Parser
+
+    try:
+        res = Parser(path, True, transitivity).run()
+        if res is None:
+            raise ValueError("Could not parse model.")
+        return {"path": str(path), "result": output_sequence(res)}
+    except Exception as error:
+        return {"path": str(path), "error": str(error)}
+
+
+def output_sequence(sequence):
+    """Returns a parsed sequence that can be written out. The transitivity of
+    a CFO holds other CFOs, and the CFO itself if it is in a loop, so it is
+    written as their IDs."""
+    return [
+        (
+            {**cfo, "transitivity": [other.get(ID) for other in cfo["transitivity"]]}
+            if "transitivity" in cfo
+            else cfo
+        )
+        for cfo in sequence
+    ]
+
+
+def compile_file(
+    path, transitivity, skip_named_gateways, constraint_type=None, cache_path=None
+):
+    """Compiles one file of a batch. As for a single file, constraints of a
+    given type are compiled with transitivity."""
+    try:
+        if constraint_type:
+            if constraint_type not in CONSTRAINT_TYPES:
+                raise ValueError("Unknown constraint type.")
+            key = CONSTRAINT_TYPES[constraint_type]
+            res = compile_diagram(path, True, skip_named_gateways, cache_path, {key})
+            res = [constraint.get(key) for constraint in res]
+        else:
+            res = compile_diagram(path, transitivity, skip_named_gateways, cache_path)
+        return {"path": str(path), "result": res}
+    except Exception as error:
+        return {"path": str(path), "error": str(error)}
+
+
+def stream_diagram(
+    path, transitivity, skip_named_gateways, cache_path=None, formats=None
+):
+    """Parses and compiles a diagram file, and returns its constraints as an
+    iterator which renders each constraint when it is read. Cached diagrams
+    are read from the cache as a whole."""
+    from bpmnconstraints.parser.bpmn_parser import Parser
+    from bpmnconstraints.compiler.bpmn_compiler import Compiler
+
+    if cache_path:
+        return compile_diagram(
+            path, transitivity, skip_named_gateways, cache_path, formats
+        )
+    res = Parser(path, True, transitivity).run()
+    return Compiler(res, transitivity, skip_named_gateways, formats).constraints()
+
+
+def compile_diagram(
+    path, transitivity, skip_named_gateways, cache_path=None, formats=None
+):
+    """Parses and compiles a diagram file to the given formats, or to all of
+    them. If a cache path is given, the constraints are read from the cache,
+    or stored in it once compiled."""
+    from bpmnconstraints.parser.bpmn_parser import Parser
+    from bpmnconstraints.compiler.bpmn_compiler import Compiler
+
+    if not cache_path:
+        res = Parser(path, True, transitivity).run()
+        return Compiler(res, transitivity, skip_named_gateways, formats).run()
+
+    from bpmnconstraints.utils.cache import (
+        ConstraintCache,
+        model_key,
+        dump_sequence,
+        REJECTED,
+    )
+
+    cache = ConstraintCache(cache_path)
+    try:
+        key = model_key(path, transitivity, skip_named_gateways, formats)
+        cached = cache.get_constraints(key)
+        if cached is not None and cached[0] not in REJECTED:
+            return cached[0]
+
+        parser = Parser(path, True, transitivity)
+        res = parser.run()
+        sequence = dump_sequence(res)
+        res = Compiler(res, transitivity, skip_named_gateways, formats).run()
+        cache.put(key, sequence, res, parser.stats.to_dict())
+        return res
+    finally:
+        cache.close()
+
+
+def compile_bpmn_diagram(
+    path_to_bpmn_diagram, constraint_type, skip_named_gateways, cache_path=None
+):
+    from tqdm import tqdm
+
     constraints = []
     setup = Setup(None)
     path_to_bpmn_diagram = Path(path_to_bpmn_diagram)
     if setup.is_file(path_to_bpmn_diagram):
-        res = Parser(path_to_bpmn_diagram, True, True).run()
-        res = Compiler(res, True, skip_named_gateways).run()
+        if constraint_type not in CONSTRAINT_TYPES:
+            logging.warning(
+                "Unknown constraint type. Use 'SIGNAL', 'DECLARE' or 'LTLF'."
+            )
+            return constraints
+
+        res = compile_diagram(
+            path_to_bpmn_diagram,
+            True,
+            skip_named_gateways,
+            cache_path,
+            {CONSTRAINT_TYPES[constraint_type]},
+        )
 
         if constraint_type == "SIGNAL":
             logging.info("Generating SIGNAL constraints...")
@@ -151,8 +394,4 @@ def compile_bpmn_diagram(path_to_bpmn_diagram, constraint_type, skip_named_gatew
             for constraint in tqdm(res):
                 constraints.append(constraint.get("LTLf"))
 
-        else:
-            logging.warning(
-                "Unknown constraint type. Use 'SIGNAL', 'DECLARE' or 'LTLF'."
-            )
     return constraints
@@ -0,0 +1,121 @@
+import io
+import json
+import threading
+from pathlib import Path
+from bpmnconstraints.parser.bpmn_parser import Parser
+from bpmnconstraints.parser.xml_model import iterparse_bpmn
+from bpmnconstraints.compiler.bpmn_compiler import Compiler
+from bpmnconstraints.utils.constants import CONSTRAINT_TYPES
+
+
+def handle_request(request):
+    """Compiles the model of one request. A request holds the model as a JSON
+    object under "model", as an XML string under "xml", or as a file path
+    under "path", and may set "transitivity", "skip_named_gateways" and
+    "constraint_type". The response echoes the "id" of the request."""
+    response = {"id": request.get("id")}
+    try:
+        transitivity = bool(request.get("transitivity", False))
+        skip_named_gateways = bool(request.get("skip_named_gateways", False))
+
+        if "model" in request:
+            parser = Parser(request["model"], False, transitivity)
+        elif "xml" in request:
+            root = iterparse_bpmn(io.BytesIO(request["xml"].encode()))
+            parser = Parser(root, False, transitivity)
+        elif "path" in request:
+            parser = Parser(Path(request["path"]), True, transitivity)
+        else:
+            raise ValueError("Request has no model, xml or path.")
+
+        key = None
+        constraint_type = request.get("constraint_type")
+        if constraint_type:
+            key = CONSTRAINT_TYPES.get(constraint_type.upper())
+            if key is None:
+                raise ValueError("Unknown constraint type.")
+
+        sequence = parser.run()
+        if sequence is None:
+            raise ValueError("Could not parse model.")
+        formats = None if key is None else {key}
+        constraints = Compiler(
+            sequence, transitivity, skip_named_gateways, formats
+        ).run()
+
+        if key is not None:
+            constraints = [constraint.get(key) for constraint in constraints]
+
+        response["constraints"] = constraints
+    except Exception as error:
+        response["error"] = str(error)
+    return response
+
+
+class CompileServer:
+    """JSON-lines server, which reads one request per line and writes one
+    response per line. The interpreter, its imports and the compiler stay
+    loaded between requests.
+
+    With one worker, requests are handled in order in this process. With more
+    workers, requests are handled by a process pool and responses are written
+    as they complete. At most max_pending requests are in flight, and reading
+    stops until one of them completes."""
+
+    def __init__(self, source, target, workers=1, max_pending=None) -> None:
+        self.source = source
+        self.target = target
+        self.workers = workers
+        self.max_pending = max_pending or 2 * max(workers, 1)
+        self.write_lock = threading.Lock()
+
+    def __read_request(self, line):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            return None, {"id": None, "error": f"Invalid JSON: {error}"}
+        if not isinstance(request, dict):
+            return None, {"id": None, "error": "Request must be a JSON object."}
+        return request, None
+
+    def __write(self, response):
+        with self.write_lock:
+            self.target.write(json.dumps(response) + "\n")
+            self.target.flush()
+
+    def run(self):
+        if self.workers <= 1:
+            for line in self.source:
+                if not line.strip():
+                    continue
+                request, error = self.__read_request(line)
+                self.__write(error or handle_request(request))
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        pending = threading.BoundedSemaphore(self.max_pending)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for line in self.source:
+                if not line.strip():
+                    continue
+                request, error = self.__read_request(line)
+                if error:
+                    self.__write(error)
+                    continue
+
+                pending.acquire()
+                future = executor.submit(handle_request, request)
+                future.add_done_callback(
+                    lambda done, request=request: self.__complete(
+                        done, request, pending
+                    )
+                )
+
+    def __complete(self, future, request, pending):
+        try:
+            response = future.result()
+        except Exception as error:
+            response = {"id": request.get("id"), "error": str(error)}
+        self.__write(response)
+        pending.release()
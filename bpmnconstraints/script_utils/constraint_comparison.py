@@ -1,25 +1,33 @@
 import json
-import re
+from numpy import arange, searchsorted
 from tqdm import tqdm
 from bpmnconstraints.utils.script_utils import Setup
-from bpmnconstraints.parser.bpmn_parser import Parser
-from bpmnconstraints.compiler.bpmn_compiler import Compiler
-from bpmnconstraints.utils.plot import Plot
+from bpmnconstraints.parser.model_stats import ModelStats, skip_compared_model
+from bpmnconstraints.script_utils.dataset_compiling import compile_entry, cached_entry
+from bpmnconstraints.utils.cache import ConstraintCache, model_key, REJECTED
+from bpmnconstraints.templates.declare_templates import Declare
 from bpmnconstraints.utils.constants import (
     DISCARDED_CONSTRAINTS,
     DECLARE_GATEWAYS,
-    DECLARE_CONSTRAINT_REGEX_PATTERN,
+    CONSTRAINT_ANNOTATION_PATTERN,
+    CONSTRAINT_TEMPLATE_PATTERN,
 )
 
 
 class ComparisonScript:
-    def __init__(self, dataset_path, dataframe_path, create_plots) -> None:
+    def __init__(
+        self, dataset_path, dataframe_path, create_plots, cache_path=None
+    ) -> None:
         self.dataset_path = dataset_path
         self.dataframe_path = dataframe_path
         self.setup = Setup(None)
-        self.plot = Plot()
+        self.plot = None
+        self.declare = Declare()
         self.transitivity = True
+        self.skip_named_gateways = False
         self.create_plot = create_plots
+        self.cache_path = cache_path
+        self.cache = None
 
     def __print_model(self, model):
         print(json.dumps(model, indent=2))
@@ -47,86 +55,113 @@ class ComparisonScript:
         print(f"F1 Score: {f1_score}")
 
         if self.create_plot:
+            from bpmnconstraints.utils.plot import Plot
+
+            self.plot = Plot()
             self.plot.scatter_plot_recall_precision_combined(models)
             self.plot.scatter_plot_precision_element_types(models)
             self.plot.scatter_plot_recall_element_types(models)
             self.plot.bar_plot_total_generated_constraints(models)
 
     def __parse_dataframe(self):
-        df = self.setup.load_dataframe(self.dataframe_path)
-        models = []
+        """Reads the constraints of every model in the dataframe, without their
+        annotations after "|" and without discarded templates. The constraints
+        of all models are processed as one exploded column."""
+        df = self.setup.load_dataframe(self.dataframe_path).reset_index(drop=True)
+
+        constraints = (
+            df["constraints"]
+            .explode()
+            .dropna()
+            .astype(str)
+            .str.extract(CONSTRAINT_ANNOTATION_PATTERN, expand=False)
+            .fillna("")
+        )
 
-        for _, row in tqdm(df.iterrows(), "Parsing dataframe"):
-            model = {
-                "model id": row["model_id"],
-                "constraints": [],
+        templates = constraints.str.extract(CONSTRAINT_TEMPLATE_PATTERN, expand=False)
+        symmetric = templates.isin(DECLARE_GATEWAYS).to_numpy()
+        constraints[symmetric] = (
+            constraints[symmetric].map(self.declare.canonical).to_numpy()
+        )
+        constraints = constraints[~templates.isin(DISCARDED_CONSTRAINTS).to_numpy()]
+
+        values = constraints.to_numpy()
+        bounds = searchsorted(constraints.index.to_numpy(), arange(len(df) + 1))
+        return [
+            {
+                "model id": model_id,
+                "constraints": values[bounds[i] : bounds[i + 1]].tolist(),
             }
+            for i, model_id in enumerate(df["model_id"])
+        ]
 
-            for constraint in row["constraints"]:
-                constraint = constraint[: constraint.find("|")].strip()
-
-                discarded_constraint = constraint
-                if discarded_constraint.split("[")[0] in DISCARDED_CONSTRAINTS:
-                    continue
-
-                model["constraints"].append(constraint)
-            models.append(model)
-        return models
+    def __compile_model(self, text):
+        """Returns the constraints and statistics of a model, from the cache if
+        it is enabled, or None if the model is filtered out or cannot be
+        compiled. The model is only loaded from its raw JSON if it is not
+        cached."""
+        key = None
+        if self.cache is not None:
+            key = model_key(text.encode(), self.transitivity, self.skip_named_gateways)
+            cached = cached_entry(self.cache, key, skip_compared_model)
+            if cached is not None:
+                constraints, stats = cached
+                if constraints in REJECTED or skip_compared_model(
+                    ModelStats.from_dict(stats)
+                ):
+                    return None
+                return constraints, stats
+
+        sequence, constraints, stats = compile_entry(
+            text,
+            self.transitivity,
+            self.skip_named_gateways,
+            keep_sequence=self.cache is not None,
+            skip=skip_compared_model,
+        )
+        if self.cache is not None:
+            self.cache.put(key, sequence, constraints, stats)
+        if constraints in REJECTED:
+            return None
+        return constraints, stats
 
     def __parse_dataset(self):
         compiled_models = []
+        if self.cache_path:
+            self.cache = ConstraintCache(self.cache_path)
 
-        for chunk in tqdm(
-            self.setup.read_csv_chunk(self.dataset_path), desc="Parsing dataset"
-        ):
-            models = self.setup.load_models(chunk)
-            model_id = chunk["Model ID"]
-
-            for i, model in enumerate(models):
-                compiled_model = {
-                    "model id": model_id.iloc[i],
-                    "constraints": [],
-                }
-
-                try:
-                    parser = Parser(model, False, self.transitivity)
+        try:
+            for chunk in tqdm(
+                self.setup.read_csv_chunk(self.dataset_path), desc="Parsing dataset"
+            ):
+                texts = self.setup.get_model_texts(chunk)
+                model_id = chunk["Model ID"]
 
-                    if parser.count_pools() > 1:
+                for i, text in enumerate(texts):
+                    compiled = self.__compile_model(text)
+                    if compiled is None:
                         continue
 
-                    result = parser.run()
-
-                    if not parser.has_start():
-                        continue
-                    if parser.count_model_elements() < 5:
-                        continue
-                    if parser.contains_multiple_starts():
-                        continue
-                    if parser.or_multiple_paths():
-                        continue
-
-                    num_model_elements = parser.count_model_elements()
-                    num_model_element_types = parser.count_model_element_types()
-                    element_types = parser.get_element_types()
-
-                    compiled_model.update(
+                    constraints, stats = compiled
+                    compiled_models.append(
                         {
-                            "number of elements": num_model_elements,
-                            "number of element types": num_model_element_types,
-                            "element types": element_types,
+                            "model id": model_id.iloc[i],
+                            "constraints": [
+                                self.declare.canonical(constraint.get("DECLARE"))
+                                for constraint in constraints
+                            ],
+                            "number of elements": stats["elements"],
+                            "number of element types": len(stats["element_types"]),
+                            "element types": stats["element_types"],
                         }
                     )
 
-                    compiler = Compiler(result, self.transitivity)
-                    result = compiler.run()
-
-                    for constraint in result:
-                        compiled_model["constraints"].append(constraint.get("DECLARE"))
-
-                    compiled_models.append(compiled_model)
-
-                except Exception:
-                    continue
+                if self.cache is not None:
+                    self.cache.commit()
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+                self.cache = None
         return compiled_models
 
     def __remove_init_constraints(self, model):
@@ -157,93 +192,49 @@ class ComparisonScript:
         model["petri net constraints"] = petri_net_constraints
         model["compiler constraints"] = compiler_constraints
 
-    def __rearrange_gateway_order(
-        self, petri_net_constraints, compiler_constraints, model_id
-    ):
-        for i, compiler_constraint in enumerate(compiler_constraints):
-            if compiler_constraint.startswith(tuple(DECLARE_GATEWAYS)):
-                match = re.match(DECLARE_CONSTRAINT_REGEX_PATTERN, compiler_constraint)
-                if match:
-                    arguments = match.group(2).split(", ")
-                    compiler_constraint_set = set(
-                        [match.group(1), arguments[0], arguments[1]]
-                    )
-                    for petri_net_constraint in petri_net_constraints:
-                        if petri_net_constraint.startswith(tuple(DECLARE_GATEWAYS)):
-                            match = re.match(
-                                DECLARE_CONSTRAINT_REGEX_PATTERN, compiler_constraint
-                            )
-                            if match:
-                                arguments = match.group(2).split(", ")
-                                petri_net_constraint_set = set(
-                                    [match.group(1), arguments[0], arguments[1]]
-                                )
-                                if compiler_constraint_set == petri_net_constraint_set:
-                                    if sorted(compiler_constraint) == sorted(
-                                        petri_net_constraint
-                                    ):
-                                        compiler_constraints[i] = petri_net_constraint
-
-    def __gateway_constraints_exists(self, compiler_constraints):
-        return any(
-            constraint.startswith(tuple(DECLARE_GATEWAYS))
-            for constraint in compiler_constraints
-        )
+    def __index_models(self, compiler_models):
+        """Maps each model ID to its compiled model. The first model with a
+        given ID wins."""
+        models_by_id = {}
+        for compiler_model in compiler_models:
+            models_by_id.setdefault(compiler_model.get("model id"), compiler_model)
+        return models_by_id
 
     def __combine_models(self, petri_net_models, compiler_models):
         combined_models = []
+        compiler_models_by_id = self.__index_models(compiler_models)
 
         for petri_net_model in tqdm(petri_net_models, desc="Combining models"):
             model_id = petri_net_model.get("model id")
             petri_net_constraints = petri_net_model.get("constraints")
-            found_matching_model = False
-
-            for compiler_model in compiler_models:
-                if compiler_model.get("model id") == model_id:
-                    compiler_constraints = compiler_model.get("constraints")
-                    number_of_elements = compiler_model.get("number of elements")
-                    number_of_element_types = compiler_model.get(
+            compiler_model = compiler_models_by_id.get(model_id)
+
+            if compiler_model is None:
+                continue
+
+            compiler_constraints = compiler_model.get("constraints")
+            if len(compiler_constraints) == 0 or len(petri_net_constraints) == 0:
+                continue
+
+            petri_net_constraint_set = set(petri_net_constraints)
+            compiler_constraint_set = set(compiler_constraints)
+            matching_constraints = len(
+                petri_net_constraint_set.intersection(compiler_constraint_set)
+            )
+
+            combined_models.append(
+                {
+                    "model id": model_id,
+                    "petri net constraints": list(petri_net_constraint_set),
+                    "compiler constraints": list(compiler_constraint_set),
+                    "number of elements": compiler_model.get("number of elements"),
+                    "number of element types": compiler_model.get(
                         "number of element types"
-                    )
-                    element_types = compiler_model.get("element types")
-                    found_matching_model = True
-                    break
-
-            if (
-                found_matching_model
-                and len(compiler_constraints) > 0
-                and len(petri_net_constraints) > 0
-            ):
-                if self.__gateway_constraints_exists(compiler_constraints):
-                    self.__rearrange_gateway_order(
-                        petri_net_constraints, compiler_constraints, model_id
-                    )
-
-                combined_models.append(
-                    {
-                        "model id": model_id,
-                        "petri net constraints": list(set(petri_net_constraints)),
-                        "compiler constraints": list(set(compiler_constraints)),
-                        "number of elements": number_of_elements,
-                        "number of element types": number_of_element_types,
-                        "element types": element_types,
-                        "precision": self.__calculate_precision(
-                            petri_net_constraints, compiler_constraints
-                        ),
-                        "recall": self.__calculate_recall(
-                            petri_net_constraints, compiler_constraints
-                        ),
-                    }
-                )
+                    ),
+                    "element types": compiler_model.get("element types"),
+                    "precision": matching_constraints / len(compiler_constraint_set),
+                    "recall": matching_constraints / len(petri_net_constraint_set),
+                }
+            )
 
         return combined_models
-
-    def __calculate_precision(self, petri_net_constraints, compiler_constraints):
-        return len(
-            set(petri_net_constraints).intersection(set(compiler_constraints))
-        ) / len(set(compiler_constraints))
-
-    def __calculate_recall(self, petri_net_constraints, compiler_constraints):
-        return len(
-            set(compiler_constraints).intersection(set(petri_net_constraints))
-        ) / len(set(petri_net_constraints))
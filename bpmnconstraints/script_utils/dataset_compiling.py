@@ -1,52 +1,190 @@
-from json import dumps
+from json import loads
+from collections import deque
+from functools import partial
 from tqdm import tqdm
 from numpy import median, average
 from bpmnconstraints.parser.bpmn_parser import Parser
+from bpmnconstraints.parser.model_stats import ModelStats, scan_model, skip_model
 from bpmnconstraints.compiler.bpmn_compiler import Compiler
-from bpmnconstraints.utils.script_utils import Setup
+from bpmnconstraints.utils.script_utils import Setup, map_in_order
+from bpmnconstraints.utils.cache import (
+    ConstraintCache,
+    model_key,
+    dump_sequence,
+    FILTERED,
+    FAILED,
+    REJECTED,
+)
+from bpmnconstraints.utils.output import OutputWriter
+
+
+def compile_entry(
+    text, transitivity, skip_named_gateways, keep_sequence=False, skip=skip_model
+):
+    """Compiles one dataset model from its raw JSON. Returns the dumped parser
+    sequence (if keep_sequence is set), the constraints and the model
+    statistics. Models which are filtered out or cannot be compiled get
+    FILTERED or FAILED in place of their constraints, so that they can be
+    cached as well.
+
+    The loaded model is only held by the parser, which replaces it by compact
+    records before parsing."""
+    try:
+        parser = Parser(loads(text), False, transitivity, compact=True)
+        stats = scan_model(parser.bpmn_model)
+    except Exception:
+        return None, FAILED, None
+
+    if skip(stats):
+        return None, FILTERED, stats.to_dict()
+
+    try:
+        result = parser.run()
+
+        if not parser.has_start():
+            return None, FAILED, stats.to_dict()
+
+        sequence = dump_sequence(result) if keep_sequence else None
+        constraints = Compiler(result, transitivity, skip_named_gateways).run()
+        return sequence, constraints, stats.to_dict()
+
+    except Exception:
+        return None, FAILED, stats.to_dict()
+
+
+def cached_entry(cache, key, skip=skip_model):
+    """Returns the cached constraints and statistics of a model, or None if
+    it must be compiled. A model filtered out by another filter is compiled
+    if this filter keeps it."""
+    entry = cache.get_constraints(key)
+    if entry is None:
+        return None
+    constraints, stats = entry
+    if constraints == FILTERED and not skip(ModelStats.from_dict(stats)):
+        return None
+    return entry
+
+
+def compile_model(text, transitivity, skip_named_gateways):
+    """Compiles one dataset model from its raw JSON. Returns None if the model
+    is filtered out or cannot be compiled."""
+    constraints = compile_entry(text, transitivity, skip_named_gateways)[1]
+    if constraints in REJECTED:
+        return None
+    return constraints
+
+
+def compile_entries(texts, transitivity, skip_named_gateways, keep_sequence):
+    return [
+        (
+            None
+            if text is None
+            else compile_entry(text, transitivity, skip_named_gateways, keep_sequence)
+        )
+        for text in texts
+    ]
 
 
 class CompilingScript:
-    def __init__(self, path, transitivity, print_models) -> None:
+    def __init__(
+        self,
+        path,
+        transitivity,
+        print_models,
+        workers=1,
+        skip_named_gateways=False,
+        cache_path=None,
+        output_format="json",
+        output_path=None,
+    ) -> None:
         self.setup = Setup(path)
         self.transitivity = transitivity
         self.print_models = print_models
+        self.workers = workers
+        self.skip_named_gateways = skip_named_gateways
+        self.cache_path = cache_path
+        self.cache = None
+        self.output = OutputWriter(output_format, output_path)
+        self.pending_chunks = deque()
         self.total_constraints = 0
         self.total_unique_constraints = 0
         self.constraints_len = []
 
-    def run(self):
+    def __model_chunks(self):
         for filename in tqdm(self.setup.get_files()):
             csv_file = self.setup.get_file(filename)
 
             if self.setup.is_file(csv_file):
                 for chunk in self.setup.read_csv_chunk(csv_file):
-                    models = self.setup.load_models(chunk)
+                    yield list(self.setup.get_model_texts(chunk))
 
-                    for model in models:
-                        try:
-                            parser = Parser(model, False, self.transitivity)
+    def __uncached_chunks(self):
+        """Yields the raw JSON of every model of a chunk which is not cached,
+        with None in place of cached models. Models are looked up by their raw
+        JSON, so cached models are never loaded. The keys and cached
+        constraints of the chunk are queued, to be merged with the results of
+        the chunk."""
+        for texts in self.__model_chunks():
+            keys = [None] * len(texts)
+            cached = [None] * len(texts)
+            if self.cache is not None:
+                keys = [
+                    model_key(
+                        text.encode(), self.transitivity, self.skip_named_gateways
+                    )
+                    for text in texts
+                ]
+                cached = [cached_entry(self.cache, key) for key in keys]
 
-                            if parser.count_pools() > 1:
-                                continue
+            self.pending_chunks.append((keys, cached))
+            yield [
+                text if entry is None else None for text, entry in zip(texts, cached)
+            ]
 
-                            result = parser.run()
+    def __merge_chunk(self, results):
+        keys, cached = self.pending_chunks.popleft()
+        for key, entry, result in zip(keys, cached, results):
+            if entry is not None:
+                constraints = entry[0]
+            else:
+                sequence, constraints, stats = result
+                if self.cache is not None:
+                    self.cache.put(key, sequence, constraints, stats)
 
-                            if not parser.has_start():
-                                continue
+            if constraints in REJECTED:
+                continue
 
-                            if parser.count_model_elements() < 5:
-                                continue
+            self.total_constraints += len(constraints)
+            self.constraints_len.append(len(constraints))
+
+            if self.print_models:
+                self.output.write(constraints)
+
+        if self.cache is not None:
+            self.cache.commit()
+
+    def run(self):
+        if self.cache_path:
+            self.cache = ConstraintCache(self.cache_path)
 
-                            result = Compiler(result, self.transitivity).run()
-                            self.total_constraints += len(result)
-                            self.constraints_len.append(len(result))
+        compile_chunk = partial(
+            compile_entries,
+            transitivity=self.transitivity,
+            skip_named_gateways=self.skip_named_gateways,
+            keep_sequence=self.cache is not None,
+        )
 
-                            if self.print_models:
-                                print(dumps(result, indent=2))
+        try:
+            with self.output:
+                for results in map_in_order(
+                    compile_chunk, self.__uncached_chunks(), self.workers
+                ):
+                    self.__merge_chunk(results)
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+                self.cache = None
 
-                        except Exception:
-                            pass
         print(f"Total generated constraints: {self.total_constraints}")
         print(f"Median: {round(median(self.constraints_len))}")
         print(f"Average: {round(average(self.constraints_len))}")
@@ -1,17 +1,58 @@
+from json import loads
 from tqdm import tqdm
 from bpmnconstraints.parser.bpmn_parser import Parser
-from bpmnconstraints.utils.script_utils import Setup
-from bpmnconstraints.utils.plot import Plot
+from bpmnconstraints.parser.model_stats import scan_model, skip_model
+from bpmnconstraints.utils.script_utils import Setup, map_in_order
 
 FAIL = "failed"
 SUCCESS = "successful"
+INCOMPLETE = "incomplete"
+
+
+def parse_model(text):
+    """Parses one dataset model from its raw JSON. Returns a tuple of the
+    outcome, the number of elements and element types, and the number of
+    parsed and parsable elements, or None if the model is filtered out.
+
+    The loaded model is only held by the parser, which replaces it by compact
+    records before parsing."""
+    try:
+        parser = Parser(loads(text), False, False, compact=True)
+        stats = scan_model(parser.bpmn_model)
+    except Exception:
+        return None
+
+    if skip_model(stats):
+        return None
+
+    model_elements = stats.elements
+    model_element_types = len(stats.element_types)
+
+    try:
+        result = parser.run()
+
+        if not parser.has_start():
+            return None
+
+        parsed = len(result)
+        parsable = parser.count_parsable_elements()
+    except Exception:
+        return FAIL, model_elements, model_element_types, 0, 0
+
+    outcome = SUCCESS if parsed == parsable else INCOMPLETE
+    return outcome, model_elements, model_element_types, parsed, parsable
+
+
+def parse_models(models):
+    return [parse_model(model) for model in models]
 
 
 class ParserScript:
-    def __init__(self, path, create_plot) -> None:
+    def __init__(self, path, create_plot, workers=1) -> None:
         self.path = path
         self.setup = Setup(path)
-        self.plot = Plot()
+        self.plot = None
+        self.workers = workers
         self.failed_models = 0
         self.successful_models = 0
         self.total_models = 0
@@ -27,57 +68,47 @@ class ParserScript:
             "number of element types": type_count,
         }
 
-    def run(self):
+    def __model_chunks(self):
         for filename in tqdm(self.setup.get_files()):
             csv_file = self.setup.get_file(filename)
 
             if self.setup.is_file(csv_file):
                 for chunk in self.setup.read_csv_chunk(csv_file):
-                    models = self.setup.load_models(chunk)
-
-                    for model in models:
-                        try:
-                            parser = Parser(model, False, False)
-
-                            if parser.count_pools() > 1:
-                                continue
-
-                            result = parser.run()
-
-                            if not parser.has_start():
-                                continue
+                    yield list(self.setup.get_model_texts(chunk))
 
-                            if parser.count_model_elements() < 5:
-                                continue
+    def __add_outcome(self, outcome):
+        model_outcome, model_elements, model_element_types, parsed, parsable = outcome
+        self.total_models += 1
 
-                            model_elements = parser.count_model_elements()
-                            model_element_types = parser.count_model_element_types()
-
-                            self.total_models += 1
-                            parsed = len(result)
-                            parsable = parser.count_parsable_elements()
+        if model_outcome == FAIL:
+            self.failed_models += 1
+            self.successful_models -= 1
+            self.parsed_models.append(
+                self.__create_scatter_object(FAIL, model_elements, model_element_types)
+            )
+            return
 
-                            self.total_parsed_elements += parsed
-                            self.total_elements += parsable
+        self.total_parsed_elements += parsed
+        self.total_elements += parsable
 
-                            if parsed == parsable:
-                                self.successful_models += 1
-                                self.parsed_models.append(
-                                    self.__create_scatter_object(
-                                        SUCCESS, model_elements, model_element_types
-                                    )
-                                )
+        if model_outcome == SUCCESS:
+            self.successful_models += 1
+            self.parsed_models.append(
+                self.__create_scatter_object(
+                    SUCCESS, model_elements, model_element_types
+                )
+            )
 
-                        except Exception:
-                            self.failed_models += 1
-                            self.successful_models -= 1
-                            self.parsed_models.append(
-                                self.__create_scatter_object(
-                                    FAIL, model_elements, model_element_types
-                                )
-                            )
+    def run(self):
+        for outcomes in map_in_order(parse_models, self.__model_chunks(), self.workers):
+            for outcome in outcomes:
+                if outcome is not None:
+                    self.__add_outcome(outcome)
 
         if self.create_plot:
+            from bpmnconstraints.utils.plot import Plot
+
+            self.plot = Plot()
             self.plot.scatter_plot_model_outcomes(
                 self.parsed_models, "All Parsed Models"
             )
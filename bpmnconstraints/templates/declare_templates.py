@@ -1,5 +1,6 @@
 """Functions to generate Declare constraints.
 """
+from bpmnconstraints.utils.constants import DECLARE_GATEWAYS
 
 
 class Declare:
@@ -88,3 +89,17 @@ class Declare:
         """{element_right} and {element_left} occur in the same process instance (AND gateway).
         Activated by {element_right} and {element_left}"""
         return f"Co-Existence[{element_left}, {element_right}]"
+
+    def canonical(self, constraint):
+        """Sorts the arguments of symmetric constraints (Choice, Exclusive Choice and
+        Co-Existence), so that equal constraints are also equal as strings.
+        Other constraints are returned unchanged."""
+        template, separator, arguments = constraint.partition("[")
+        if not separator or template not in DECLARE_GATEWAYS:
+            return constraint
+        if not arguments.endswith("]"):
+            return constraint
+        arguments = arguments[:-1].split(", ")
+        if len(arguments) != 2:
+            return constraint
+        return f"{template}[{', '.join(sorted(arguments))}]"
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import zlib
+from pathlib import Path
+
+CACHE_VERSION = 1
+TRANSITIVITY = "transitivity"
+
+# Stored in place of the constraints of models which were not compiled.
+FILTERED = "filtered"
+FAILED = "failed"
+REJECTED = (FILTERED, FAILED)
+
+
+def model_key(model, transitivity, skip_named_gateways, formats=None):
+    """Hashes a model together with the options it is compiled with. Models
+    are either the raw bytes of a model, loaded JSON models, or paths to JSON
+    or XML files. Formats are only part of the key if a subset of them is
+    compiled."""
+    if isinstance(model, bytes):
+        content = model
+    elif isinstance(model, dict):
+        content = json.dumps(model, sort_keys=True, separators=(",", ":")).encode()
+    else:
+        content = Path(model).read_bytes()
+
+    digest = hashlib.sha256(content)
+    digest.update(
+        f"|{CACHE_VERSION}|{bool(transitivity)}|{bool(skip_named_gateways)}".encode()
+    )
+    if formats is not None:
+        digest.update(f"|{','.join(sorted(formats))}".encode())
+    return digest.hexdigest()
+
+
+def dump_sequence(sequence):
+    """Serializes a parsed sequence. The transitivity of a CFO refers to other
+    CFOs of the sequence, so it is stored as their indices. The sequence must
+    be dumped before it is compiled, since the compiler modifies it."""
+    indices = {id(cfo): index for index, cfo in enumerate(sequence)}
+    encoded = []
+    for cfo in sequence:
+        if TRANSITIVITY in cfo:
+            cfo = dict(cfo)
+            cfo[TRANSITIVITY] = [indices[id(other)] for other in cfo[TRANSITIVITY]]
+        encoded.append(cfo)
+    return dump_json(encoded)
+
+
+def load_sequence(blob):
+    sequence = load_json(blob)
+    for cfo in sequence:
+        if TRANSITIVITY in cfo:
+            cfo[TRANSITIVITY] = [sequence[index] for index in cfo[TRANSITIVITY]]
+    return sequence
+
+
+def dump_json(value):
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+
+
+def load_json(blob):
+    return json.loads(zlib.decompress(blob))
+
+
+class ConstraintCache:
+    """On-disk SQLite store of parsed and compiled models, keyed by model_key.
+    Each entry holds the sequence of the parser, the constraints of the
+    compiler and the model statistics, each as compressed JSON.
+
+    Models which were filtered out or failed to compile are stored too, with
+    FILTERED or FAILED in place of their constraints and without a sequence.
+    Their statistics are None if the model could not be scanned."""
+
+    def __init__(self, path) -> None:
+        import sqlite3
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS models "
+            "(key TEXT PRIMARY KEY, sequence BLOB, constraints BLOB, stats BLOB)"
+        )
+
+    def get_constraints(self, key):
+        """Returns the constraints and statistics of a model, or None if the
+        model is not cached. The constraints are FILTERED or FAILED if the
+        model was not compiled."""
+        row = self.connection.execute(
+            "SELECT constraints, stats FROM models WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return load_json(row[0]), load_json(row[1])
+
+    def get_sequence(self, key):
+        row = self.connection.execute(
+            "SELECT sequence FROM models WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return load_sequence(row[0])
+
+    def put(self, key, sequence, constraints, stats):
+        """Stores a model. The sequence is dumped with dump_sequence, or None
+        if the model was not compiled, and the statistics are a dictionary."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO models VALUES (?, ?, ?, ?)",
+            (key, sequence, dump_json(constraints), dump_json(stats)),
+        )
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
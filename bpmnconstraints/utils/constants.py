@@ -73,6 +73,8 @@ ALLOWED_SWIMLANES = [
     "lane",
 ]
 
+POOL = "pool"
+
 ALLOWED_CONNECTING_OBJECTS = ["sequenceflow"]
 
 GATEWAY_MAPPING = {
@@ -166,8 +168,20 @@ NAME = "name"
 
 DECLARE_CONSTRAINT_REGEX_PATTERN = r"(\w+(?:-\w+)?(?: \w+)?)(?: \w+)?\[(.*?)\]"
 
+# Matches a mined constraint up to its first "|". Like slicing at str.find, a
+# constraint without an annotation loses its last character.
+CONSTRAINT_ANNOTATION_PATTERN = r"^\s*([^|]*?)\s*(?:\|[\s\S]*|[^|])\Z"
+CONSTRAINT_TEMPLATE_PATTERN = r"^([^\[]*)"
+
 DECLARE_GATEWAYS = ["Co-Existence", "Choice", "Exclusive Choice"]
 
+SIGNAL = "SIGNAL"
+DECLARE = "DECLARE"
+LTLF = "LTLf"
+CONSTRAINT_TYPES = {"SIGNAL": SIGNAL, "DECLARE": DECLARE, "LTLF": LTLF}
+DIAGRAM_SUFFIXES = [".json", ".xml"]
+OUTPUT_FORMATS = ["json", "jsonl", "compact", "msgpack"]
+
 DEFAULT_DIRECTION = "LR"
 SEQUENCE_FLOW = "-->"
 # END_EVENT_STYLING_DEF = "classDef EndEvent fill:stroke:#000,stroke-width:4px"
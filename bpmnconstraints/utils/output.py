@@ -0,0 +1,83 @@
+import sys
+from json import dumps
+
+
+class OutputWriter:
+    """Writes results to stdout, or to a file if a path is given.
+
+    json: indented JSON, one document per result.
+    compact: JSON without whitespace, one line per result.
+    jsonl: one line per item of a result.
+    msgpack: one MessagePack object per item, requires the msgpack package.
+    """
+
+    def __init__(self, output_format="json", path=None) -> None:
+        self.output_format = output_format
+        self.path = path
+        self.binary = output_format == "msgpack"
+        self.packer = None
+        self.target = None
+
+        if self.binary:
+            try:
+                import msgpack
+            except ImportError as error:
+                raise ImportError(
+                    "The msgpack output format requires the msgpack package."
+                ) from error
+            self.packer = msgpack.Packer()
+
+    def __enter__(self):
+        if self.path:
+            if self.binary:
+                self.target = open(self.path, "wb")
+            else:
+                self.target = open(self.path, "w", encoding="utf-8")
+        else:
+            self.target = sys.stdout.buffer if self.binary else sys.stdout
+        return self
+
+    def __exit__(self, *_):
+        if self.path:
+            self.target.close()
+        else:
+            self.target.flush()
+        self.target = None
+
+    def __write_value(self, value, indent=None):
+        if self.binary:
+            self.target.write(self.packer.pack(value))
+        elif indent:
+            self.target.write(dumps(value, indent=indent) + "\n")
+        else:
+            self.target.write(dumps(value, separators=(",", ":")) + "\n")
+
+    def write(self, result):
+        """Writes the whole result of one model. A list is written item by
+        item for the jsonl and msgpack formats."""
+        if self.output_format == "json":
+            self.__write_value(result, indent=2)
+        elif self.output_format == "compact" or not isinstance(result, list):
+            self.__write_value(result)
+        else:
+            for item in result:
+                self.__write_value(item)
+
+    def write_items(self, items):
+        """Writes the items of one model, such as constraints. For the jsonl
+        and msgpack formats, each item is written as soon as it is produced.
+        For json and compact, the items are written as one list, unless there
+        are none."""
+        if self.output_format in ("json", "compact"):
+            items = list(items)
+            if items:
+                self.write(items)
+            return
+        for item in items:
+            self.__write_value(item)
+
+    def write_record(self, record):
+        """Writes one record of a stream, such as the result of one file of a
+        batch, as a single line or MessagePack object."""
+        self.__write_value(record)
+        self.target.flush()
@@ -1,6 +1,6 @@
 import json
 import os
-import pandas as pd
+from collections import deque
 
 
 class Setup:
@@ -21,10 +21,40 @@ class Setup:
         return os.path.isdir(dir_path)
 
     def read_csv_chunk(self, file):
+        import pandas as pd
+
         return pd.read_csv(file, chunksize=self.chunk_size)
 
     def load_models(self, chunk):
         return chunk["Model JSON"].apply(json.loads)
 
+    def get_model_texts(self, chunk):
+        return chunk["Model JSON"]
+
     def load_dataframe(self, file):
+        import pandas as pd
+
         return pd.read_pickle(file)
+
+
+def map_in_order(function, chunks, workers, max_pending=None):
+    """Applies function to every chunk, and yields the results in the order of
+    the chunks. With more than one worker the chunks are processed by a pool of
+    processes, with at most max_pending chunks (twice the number of workers by
+    default) submitted at a time."""
+    if workers is None or workers <= 1:
+        for chunk in chunks:
+            yield function(chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -15,7 +15,8 @@ setuptools.setup(
     url="https://github.com/signavio/bpmn2constraints",
     py_modules=["bpmnconstraints"],
     entry_points={"console_scripts": ["bpmnconstraints=bpmnconstraints.script:run"]},
-    install_requires=["pylogics", "xmltodict"],
+    install_requires=["pylogics"],
+    extras_require={"msgpack": ["msgpack"]},
     keywords="BPMN Conformance",
     classifiers=["BPMN", "Conformance Checking"],
 )
@@ -79,6 +79,30 @@ XOR_GATEWAY_SEQUENCE_DIAGRAM = {
     "xmlpath": "examples/xor_gates/multiple_xor.xml",
 }
 
+SIMPLE_LOOP_DIAGRAM = {
+    "path": "examples/loops/simple_loop.json",
+    "xmlpath": "examples/loops/simple_loop.xml",
+    "loop elements": [
+        "sid-07735648-495B-411E-BD2D-3191A4DD79A6",
+        "sid-CF4371BA-AC7D-47AA-B6C0-AB3F78751467",
+    ],
+}
+
+NESTED_LANES_DIAGRAM = {
+    "path": "examples/misc/nested_lanes.json",
+    "element types": {
+        "task": 4,
+        "endnoneevent": 1,
+        "startnoneevent": 1,
+        "sequenceflow": 5,
+    },
+}
+
+OR_GATEWAY_DIAGRAM = {
+    "path": "examples/or_gates/single_or_gateway.json",
+    "xmlpath": "examples/or_gates/single_or_gateway.xml",
+}
+
 REQUIREMENTS_TXT = {"path": "requirements.txt"}
 
 LINEAR_MERMAID_GRAPH = {
@@ -0,0 +1,63 @@
+import json
+import sys
+from pathlib import Path
+from bpmnconstraints.script import run, batch_paths
+from file_constants import LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END
+
+LINEAR_DIRECTORY = str(Path(LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END["path"]).parent)
+
+
+def run_batch(monkeypatch, capsys, arguments):
+    monkeypatch.setattr(sys, "argv", ["bpmnconstraints"] + arguments)
+    run()
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_batch_paths_of_directory_and_glob():
+    paths = batch_paths(LINEAR_DIRECTORY)
+    assert [path.name for path in paths] == [
+        "linear_sequence.json",
+        "linear_sequence.xml",
+    ]
+    assert batch_paths(f"{LINEAR_DIRECTORY}/*.json") == paths[:1]
+    assert batch_paths(f"{LINEAR_DIRECTORY}/missing") == []
+
+
+def test_parse_directory(monkeypatch, capsys):
+    lines = run_batch(monkeypatch, capsys, ["--parse", LINEAR_DIRECTORY])
+    assert [Path(line["path"]).name for line in lines] == [
+        "linear_sequence.json",
+        "linear_sequence.xml",
+    ]
+    assert [cfo["name"] for cfo in lines[0]["result"]] == [
+        "register invoice",
+        "check invoice",
+        "accept invoice",
+    ]
+
+
+def test_compile_glob_with_workers(monkeypatch, capsys):
+    arguments = ["--compile", f"{LINEAR_DIRECTORY}/*", "--constraint_type", "DECLARE"]
+    lines = run_batch(monkeypatch, capsys, arguments)
+    assert lines == run_batch(monkeypatch, capsys, arguments + ["--workers", "2"])
+    assert "Init[register invoice]" in lines[0]["result"]
+    assert lines[0]["result"] == lines[1]["result"]
+
+
+def test_unknown_constraint_type_is_reported_per_file(monkeypatch, capsys):
+    arguments = ["--compile", LINEAR_DIRECTORY, "--constraint_type", "UNKNOWN"]
+    lines = run_batch(monkeypatch, capsys, arguments)
+    assert len(lines) == 2
+    assert all("error" in line for line in lines)
+
+
+def test_malformed_files_are_reported_per_file(monkeypatch, capsys, tmp_path):
+    (tmp_path / "malformed.json").write_text("{bad", encoding="utf-8")
+    (tmp_path / "empty.json").write_text("{}", encoding="utf-8")
+    for command in ["--parse", "--compile"]:
+        lines = run_batch(monkeypatch, capsys, [command, str(tmp_path)])
+        assert [Path(line["path"]).name for line in lines] == [
+            "empty.json",
+            "malformed.json",
+        ]
+        assert all("error" in line for line in lines)
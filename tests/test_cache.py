@@ -0,0 +1,83 @@
+from pathlib import Path
+from bpmnconstraints.parser.bpmn_parser import Parser
+from bpmnconstraints.compiler.bpmn_compiler import Compiler
+from bpmnconstraints.script_utils import dataset_compiling
+from bpmnconstraints.script_utils.dataset_compiling import CompilingScript
+from bpmnconstraints.utils.cache import (
+    ConstraintCache,
+    model_key,
+    dump_sequence,
+    load_sequence,
+)
+from file_constants import (
+    SIMPLE_LOOP_DIAGRAM,
+    LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
+)
+from test_dataset_scripts import create_dataset
+
+
+def test_sequence_with_transitivity_is_restored():
+    sequence = Parser(Path(SIMPLE_LOOP_DIAGRAM["path"]), True, True).run()
+    restored = load_sequence(dump_sequence(sequence))
+    assert [cfo["id"] for cfo in restored] == [cfo["id"] for cfo in sequence]
+
+    for cfo, restored_cfo in zip(sequence, restored):
+        assert [other["id"] for other in cfo.get("transitivity", [])] == [
+            other["id"] for other in restored_cfo.get("transitivity", [])
+        ]
+        for other in restored_cfo.get("transitivity", []):
+            assert any(other is restored_other for restored_other in restored)
+
+
+def test_key_depends_on_options():
+    path = Path(LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END["path"])
+    assert model_key(path, True, False) == model_key(path, True, False)
+    assert model_key(path, True, False) != model_key(path, False, False)
+    assert model_key(path, True, False) != model_key(path, True, True)
+    assert model_key(path, True, False) != model_key(path, True, False, {"DECLARE"})
+
+
+def test_cached_model_is_read_back(tmp_path):
+    path = Path(LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END["path"])
+    parser = Parser(path, True, False)
+    sequence = parser.run()
+    dumped = dump_sequence(sequence)
+    constraints = Compiler(sequence, False, False).run()
+
+    cache = ConstraintCache(tmp_path / "cache.db")
+    key = model_key(path, False, False)
+    assert cache.get_constraints(key) is None
+    cache.put(key, dumped, constraints, parser.stats.to_dict())
+    cache.close()
+
+    cache = ConstraintCache(tmp_path / "cache.db")
+    cached_constraints, stats = cache.get_constraints(key)
+    assert cached_constraints == constraints
+    assert stats["elements"] == parser.count_model_elements()
+    assert cache.get_sequence(key) == Parser(path, True, False).run()
+    cache.close()
+
+
+def test_warm_run_reads_from_cache(tmp_path, monkeypatch):
+    dataset_path = tmp_path / "dataset"
+    dataset_path.mkdir()
+    # A model without elements is filtered out, and a malformed one fails.
+    create_dataset(dataset_path, 6, ['{"childShapes": []}', "{bad"])
+    cache_path = tmp_path / "cache.db"
+
+    uncached = CompilingScript(dataset_path, True, False)
+    uncached.run()
+    cold = CompilingScript(dataset_path, True, False, cache_path=cache_path)
+    cold.run()
+
+    def compile_entry(*args, **kwargs):
+        raise AssertionError("cached model was compiled")
+
+    monkeypatch.setattr(dataset_compiling, "compile_entry", compile_entry)
+    warm = CompilingScript(dataset_path, True, False, cache_path=cache_path)
+    warm.run()
+
+    assert len(uncached.constraints_len) == 6
+    assert cold.constraints_len == uncached.constraints_len
+    assert warm.constraints_len == uncached.constraints_len
+    assert warm.total_constraints == uncached.total_constraints
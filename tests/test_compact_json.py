@@ -0,0 +1,36 @@
+from bpmnconstraints.parser.bpmn_parser import Parser
+from bpmnconstraints.parser.json_model import ElementRecord
+from file_constants import (
+    LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
+    PARALLEL_GATEWAY_DIAGRAM,
+    XOR_GATEWAY_DIAGRAM,
+)
+from test_utils import load_test_model
+
+
+def parse(diagram_constant, compact):
+    return Parser(load_test_model(diagram_constant), False, False, compact).run()
+
+
+def test_compact_parsing_generates_same_output():
+    for diagram in [
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
+        PARALLEL_GATEWAY_DIAGRAM,
+        XOR_GATEWAY_DIAGRAM,
+    ]:
+        assert parse(diagram, True) == parse(diagram, False)
+
+
+def test_compact_parser_keeps_only_element_records():
+    parser = Parser(load_test_model(PARALLEL_GATEWAY_DIAGRAM), False, False, True)
+    parser.run()
+    for elem in parser.model.get_diagram_elements():
+        assert isinstance(elem, ElementRecord)
+        assert not hasattr(elem, "__dict__")
+
+
+def test_parser_of_json_file_keeps_only_element_records():
+    parser = Parser(PARALLEL_GATEWAY_DIAGRAM.get("path"), True, False)
+    parser.run()
+    for elem in parser.model.get_diagram_elements():
+        assert isinstance(elem, ElementRecord)
@@ -0,0 +1,53 @@
+import io
+import json
+from bpmnconstraints.script_utils.compile_server import CompileServer
+from file_constants import LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END
+from test_utils import load_test_model
+
+
+def serve(requests, workers=1):
+    source = io.StringIO("\n".join(requests) + "\n")
+    target = io.StringIO()
+    CompileServer(source, target, workers=workers).run()
+    return [json.loads(line) for line in target.getvalue().splitlines()]
+
+
+def load_requests():
+    model = load_test_model(LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END)
+    with open(
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END["xmlpath"], "r", encoding="utf-8"
+    ) as file:
+        xml = file.read()
+    return [
+        json.dumps({"id": 1, "model": model, "constraint_type": "DECLARE"}),
+        json.dumps({"id": 2, "xml": xml, "constraint_type": "DECLARE"}),
+        json.dumps(
+            {"id": 3, "path": LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END["path"]}
+        ),
+    ]
+
+
+def test_requests_are_compiled():
+    responses = serve(load_requests())
+    assert [response["id"] for response in responses] == [1, 2, 3]
+    assert "Init[register invoice]" in responses[0]["constraints"]
+    assert responses[0]["constraints"] == responses[1]["constraints"]
+    assert [constraint["DECLARE"] for constraint in responses[2]["constraints"]] == (
+        responses[0]["constraints"]
+    )
+
+
+def test_invalid_requests_get_errors():
+    responses = serve(["not json", json.dumps({"id": 4}), "[]"])
+    assert len(responses) == 3
+    assert all("error" in response for response in responses)
+    assert responses[1]["id"] == 4
+
+
+def test_worker_pool_answers_every_request():
+    requests = load_requests() * 3
+    responses = serve(requests, workers=2)
+    serial = serve(requests)
+    assert sorted(json.dumps(response) for response in responses) == sorted(
+        json.dumps(response) for response in serial
+    )
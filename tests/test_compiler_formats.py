@@ -0,0 +1,31 @@
+from pathlib import Path
+from bpmnconstraints.parser.bpmn_parser import Parser
+from bpmnconstraints.compiler.bpmn_compiler import Compiler
+from file_constants import XOR_GATEWAY_SEQUENCE_DIAGRAM
+
+
+def compile_diagram(formats=None):
+    res = Parser(Path(XOR_GATEWAY_SEQUENCE_DIAGRAM["path"]), True, True).run()
+    return Compiler(res, True, False, formats).run()
+
+
+def test_all_formats_are_compiled_by_default():
+    res = compile_diagram()
+    assert all(
+        list(constraint) == ["description", "SIGNAL", "DECLARE", "LTLf"]
+        for constraint in res
+    )
+
+
+def test_only_requested_formats_are_compiled():
+    res = compile_diagram()
+    for formats in [{"SIGNAL"}, {"DECLARE"}, {"LTLf"}, {"SIGNAL", "LTLf"}]:
+        subset = compile_diagram(formats)
+        assert subset == [
+            {
+                key: value
+                for key, value in constraint.items()
+                if key in formats or key == "description"
+            }
+            for constraint in res
+        ]
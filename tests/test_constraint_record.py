@@ -0,0 +1,51 @@
+from pathlib import Path
+from bpmnconstraints.parser.bpmn_parser import Parser
+from bpmnconstraints.compiler.bpmn_compiler import Compiler
+from bpmnconstraints.compiler.constraint_record import ConstraintRecord, Template
+from file_constants import XOR_GATEWAY_SEQUENCE_DIAGRAM
+
+
+def create_compiler():
+    res = Parser(Path(XOR_GATEWAY_SEQUENCE_DIAGRAM["path"]), True, True).run()
+    return Compiler(res, True, False, {"DECLARE"})
+
+
+def compile_records():
+    compiler = create_compiler()
+    return compiler, compiler.compile()
+
+
+def test_records_render_to_declare_constraints():
+    compiler, records = compile_records()
+    assert records
+    for record in records:
+        declare = compiler.render(record)["DECLARE"]
+        assert declare == f"{record.template.value}[{', '.join(record.activities())}]"
+
+
+def test_record_elements_are_interned():
+    _, records = compile_records()
+    names = {}
+    for record in records:
+        for element in record.elements:
+            assert names.setdefault(element, element) is element
+
+
+def test_record_has_no_instance_dictionary():
+    record = ConstraintRecord("{} or {}", Template.CHOICE, "a", "b")
+    assert not hasattr(record, "__dict__")
+    assert record.description() == "a or b"
+    assert record.activities() == ("b", "a")
+
+
+def test_records_are_rendered_when_read():
+    _, records = compile_records()
+    compiler = create_compiler()
+    rendered = []
+    render = compiler.render
+    compiler.render = lambda record: rendered.append(record) or render(record)
+    constraints = compiler.constraints()
+    assert rendered == []
+    assert next(constraints) == render(records[0])
+    assert len(rendered) == 1
+    assert list(constraints) == [render(record) for record in records[1:]]
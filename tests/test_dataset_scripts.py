@@ -0,0 +1,122 @@
+import csv
+import json
+import pandas as pd
+from bpmnconstraints.script_utils.constraint_comparison import ComparisonScript
+from bpmnconstraints.script_utils.dataset_compiling import (
+    CompilingScript,
+    compile_model,
+)
+from bpmnconstraints.script_utils.dataset_parsing import (
+    ParserScript,
+    parse_model,
+    SUCCESS,
+)
+from bpmnconstraints.utils.script_utils import map_in_order
+from bpmnconstraints.utils.constants import DECLARE_GATEWAYS
+from file_constants import (
+    LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
+    NESTED_LANES_DIAGRAM,
+    OR_GATEWAY_DIAGRAM,
+)
+
+
+def create_dataset(path, rows, extra_models=()):
+    diagrams = [
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
+        NESTED_LANES_DIAGRAM,
+        OR_GATEWAY_DIAGRAM,
+    ]
+    with open(path / "models.csv", "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, ["Model ID", "Model JSON"])
+        writer.writeheader()
+        for i in range(rows):
+            diagram = diagrams[i % len(diagrams)]
+            with open(diagram["path"], "r", encoding="utf-8") as model:
+                writer.writerow({"Model ID": i, "Model JSON": model.read()})
+        for i, model in enumerate(extra_models, rows):
+            writer.writerow({"Model ID": i, "Model JSON": model})
+
+
+def test_map_in_order_keeps_chunk_order():
+    chunks = [[i, i + 1] for i in range(20)]
+    assert list(map_in_order(sum, chunks, 1)) == list(
+        map_in_order(sum, chunks, 2, max_pending=3)
+    )
+
+
+def test_parallel_compiling_matches_serial_run(tmp_path):
+    create_dataset(tmp_path, 150)
+    serial = CompilingScript(tmp_path, True, False)
+    serial.run()
+    parallel = CompilingScript(tmp_path, True, False, workers=2)
+    parallel.run()
+    assert serial.total_constraints > 0
+    assert parallel.total_constraints == serial.total_constraints
+    assert parallel.constraints_len == serial.constraints_len
+
+
+def test_compiled_models_are_written_as_json_lines(tmp_path):
+    dataset_path = tmp_path / "dataset"
+    dataset_path.mkdir()
+    create_dataset(dataset_path, 6)
+    output_path = tmp_path / "constraints.jsonl"
+    script = CompilingScript(
+        dataset_path, True, True, output_format="jsonl", output_path=output_path
+    )
+    script.run()
+    with open(output_path, "r", encoding="utf-8") as file:
+        constraints = [json.loads(line) for line in file]
+    assert len(constraints) == script.total_constraints
+    assert all("DECLARE" in constraint for constraint in constraints)
+
+
+def test_parse_model_outcome():
+    with open(NESTED_LANES_DIAGRAM["path"], "r", encoding="utf-8") as file:
+        text = file.read()
+    assert parse_model(text) == (SUCCESS, 11, 4, 4, 4)
+
+
+def test_parallel_parsing_matches_serial_run(tmp_path):
+    create_dataset(tmp_path, 150)
+    serial = ParserScript(tmp_path, False)
+    serial.run()
+    parallel = ParserScript(tmp_path, False, workers=2)
+    parallel.run()
+    assert serial.total_models > 0
+    assert parallel.parsed_models == serial.parsed_models
+    assert parallel.successful_models == serial.successful_models
+    assert parallel.failed_models == serial.failed_models
+    assert parallel.total_models == serial.total_models
+    assert parallel.total_elements == serial.total_elements
+    assert parallel.total_parsed_elements == serial.total_parsed_elements
+
+
+def swap_arguments(constraint):
+    template, _, arguments = constraint.partition("[")
+    if template not in DECLARE_GATEWAYS:
+        return constraint
+    return f"{template}[{', '.join(reversed(arguments[:-1].split(', ')))}]"
+
+
+def test_comparison_of_identical_constraints(tmp_path, capsys):
+    create_dataset(tmp_path, 3)
+    dataset_path = tmp_path / "models.csv"
+    rows = []
+    for _, row in pd.read_csv(dataset_path).iterrows():
+        constraints = compile_model(row["Model JSON"], True, False)
+        rows.append(
+            {
+                "model_id": row["Model ID"],
+                "constraints": [
+                    f"{swap_arguments(constraint.get('DECLARE'))} | support: 1.0"
+                    for constraint in constraints
+                ],
+            }
+        )
+    dataframe_path = tmp_path / "constraints.pkl"
+    pd.DataFrame(rows).to_pickle(dataframe_path)
+
+    ComparisonScript(dataset_path, dataframe_path, False).run()
+    output = capsys.readouterr().out
+    assert "Mean Precision: 1.0" in output
+    assert "Mean Recall: 1.0" in output
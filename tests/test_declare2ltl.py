@@ -0,0 +1,102 @@
+from pylogics.syntax.base import And
+from pylogics.utils.to_string import to_string
+from bpmnconstraints.compiler.ltl.declare2ltl import (
+    Declare2ltl,
+    _occurrences_skeleton,
+    ALTERNATE_PRECEDENCE,
+    ALTERNATE_RESPONSE,
+    ALTERNATE_SUCCESSION,
+    CHOICE,
+    EXACTLY,
+    EXISTENCE,
+    ABSENCE,
+    INIT,
+    PRECEDENCE,
+    RESPONSE,
+    SUCCESSION,
+    TEMPLATES,
+)
+
+ACTIVITIES = ["check invoice", "accept_invoice", "x-ray", "a", "A", "a, b"]
+
+
+def pylogics_rendering(ltl, template, activity_left, activity_right, n):
+    try:
+        return to_string(ltl.to_ltl(template, activity_left, activity_right, n))
+    except Exception:
+        return "Not translatable"
+
+
+def test_structured_translation_matches_declare_string():
+    ltl = Declare2ltl()
+    for template in [INIT, CHOICE, RESPONSE, SUCCESSION, ALTERNATE_SUCCESSION]:
+        constraint = f"{template}[check invoice, accept invoice]"
+        assert ltl.template_to_ltl_str(
+            template, "check invoice", "accept invoice"
+        ) == ltl.to_ltl_str(constraint)
+
+
+def test_composite_templates_are_built_from_their_parts():
+    ltl = Declare2ltl()
+    assert ltl.to_ltl(SUCCESSION, "a", "b") == And(
+        ltl.to_ltl(RESPONSE, "a", "b"), ltl.to_ltl(PRECEDENCE, "a", "b")
+    )
+    assert ltl.to_ltl(ALTERNATE_SUCCESSION, "a", "b") == And(
+        ltl.to_ltl(ALTERNATE_RESPONSE, "a", "b"),
+        ltl.to_ltl(ALTERNATE_PRECEDENCE, "a", "b"),
+    )
+    assert ltl.to_ltl(EXACTLY, "a", n=2) == And(
+        ltl.to_ltl(EXISTENCE, "a", n=2), ltl.to_ltl(ABSENCE, "a", n=3)
+    )
+
+
+def test_untranslatable_constraints():
+    ltl = Declare2ltl()
+    assert ltl.to_ltl_str("Existence[a]") == "Not translatable"
+    assert ltl.to_ltl_str("Response[]") == "Not translatable"
+    assert ltl.template_to_ltl_str("Unknown", "a", "b") == "Not translatable"
+    assert to_string(ltl.to_ltl(INIT, "check invoice")) == "check_invoice"
+
+
+def test_repeated_translations_are_cache_hits():
+    Declare2ltl.cache_clear()
+    first = Declare2ltl().to_ltl_str("Response[check invoice, accept invoice]")
+    second = Declare2ltl().template_to_ltl_str(
+        RESPONSE, "check invoice", "accept invoice"
+    )
+    assert first == second
+    info = Declare2ltl.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_skeletons_match_pylogics_rendering_for_all_templates():
+    Declare2ltl.cache_clear()
+    ltl = Declare2ltl()
+    for template in TEMPLATES:
+        for n in range(5):
+            for activity_left in ACTIVITIES:
+                for activity_right in ACTIVITIES + [None]:
+                    assert ltl.template_to_ltl_str(
+                        template, activity_left, activity_right, n
+                    ) == pylogics_rendering(
+                        ltl, template, activity_left, activity_right, n
+                    )
+
+
+def test_cardinality_templates_for_any_n():
+    ltl = Declare2ltl()
+    for template in [EXISTENCE, ABSENCE, EXACTLY]:
+        for n in range(1, 13):
+            assert ltl.template_to_ltl_str(template, "a", n=n) == pylogics_rendering(
+                ltl, template, "a", None, n
+            )
+    assert ltl.to_ltl_str("Existence12[a]") == ltl.template_to_ltl_str(
+        EXISTENCE, "a", n=12
+    )
+    assert ltl.to_ltl_str("Absence1000[a]").count("X[!]") == 999
+
+
+def test_absence_builds_only_its_own_skeleton():
+    Declare2ltl.cache_clear()
+    Declare2ltl().to_ltl_str("Absence5[a]")
+    assert _occurrences_skeleton.cache_info().misses == 1
@@ -0,0 +1,17 @@
+from bpmnconstraints.templates.declare_templates import Declare
+
+
+def test_symmetric_constraints_have_one_canonical_form():
+    declare = Declare()
+    for template in [declare.choice, declare.exclusive_choice, declare.co_existence]:
+        assert declare.canonical(template("b", "a")) == declare.canonical(
+            template("a", "b")
+        )
+        assert declare.canonical(template("b", "a")) == template("b", "a")
+
+
+def test_other_constraints_are_unchanged():
+    declare = Declare()
+    assert declare.canonical("Succession[b, a]") == "Succession[b, a]"
+    assert declare.canonical("Init[b]") == "Init[b]"
+    assert declare.canonical("Choice[a, b, c]") == "Choice[a, b, c]"
@@ -0,0 +1,111 @@
+from copy import deepcopy
+from bpmnconstraints.parser.bpmn_parser import Parser
+from bpmnconstraints.parser.model_stats import (
+    scan_model,
+    skip_model,
+    skip_compared_model,
+)
+from bpmnconstraints.parser.xml_model import iterparse_bpmn
+from file_constants import (
+    LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
+    MULTIPLE_STARTS_DIAGRAM,
+    NESTED_LANES_DIAGRAM,
+    OR_GATEWAY_DIAGRAM,
+)
+from test_utils import init_test_parser, load_test_model
+
+
+def test_element_counts_are_collected():
+    parser = init_test_parser(NESTED_LANES_DIAGRAM)
+    assert parser.get_element_types() == NESTED_LANES_DIAGRAM.get("element types")
+    assert parser.count_model_elements() == 11
+    assert parser.count_model_element_types() == 4
+    assert parser.count_parsable_elements() == 4
+
+
+def test_pools_are_counted_before_flattening():
+    assert init_test_parser(NESTED_LANES_DIAGRAM).count_pools() == 1
+    assert (
+        init_test_parser(LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END).count_pools() == 0
+    )
+
+
+def test_multiple_starts_are_detected():
+    assert init_test_parser(MULTIPLE_STARTS_DIAGRAM).contains_multiple_starts()
+    assert init_test_parser(MULTIPLE_STARTS_DIAGRAM, True).contains_multiple_starts()
+    assert not init_test_parser(
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END
+    ).contains_multiple_starts()
+
+
+def test_or_gateway_with_multiple_paths_is_detected():
+    assert init_test_parser(OR_GATEWAY_DIAGRAM).or_multiple_paths()
+    assert init_test_parser(OR_GATEWAY_DIAGRAM, True).or_multiple_paths()
+    assert not init_test_parser(
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END
+    ).or_multiple_paths()
+
+
+def test_scan_matches_parser_statistics():
+    for diagram_constant in [
+        NESTED_LANES_DIAGRAM,
+        MULTIPLE_STARTS_DIAGRAM,
+        OR_GATEWAY_DIAGRAM,
+    ]:
+        stats = scan_model(load_test_model(diagram_constant))
+        parser = init_test_parser(diagram_constant)
+        assert stats.pools == parser.count_pools()
+        assert stats.elements == parser.count_model_elements()
+        assert stats.element_types == parser.get_element_types()
+        assert stats.parsable_elements == parser.count_parsable_elements()
+        assert stats.contains_multiple_starts() == parser.contains_multiple_starts()
+        assert stats.or_multiple_paths == parser.or_multiple_paths()
+        assert stats.has_start_candidate
+
+
+def test_scan_does_not_modify_model():
+    model = load_test_model(NESTED_LANES_DIAGRAM)
+    original = deepcopy(model)
+    scan_model(model)
+    assert model == original
+
+
+def test_scan_xml_model():
+    path = OR_GATEWAY_DIAGRAM["xmlpath"]
+    stats = scan_model(iterparse_bpmn(path))
+    assert stats.pools == 1
+    assert stats.or_multiple_paths
+    assert stats.has_start_candidate
+
+
+def shape(resource_id, stencil, outgoing, name=None):
+    properties = {"name": name} if name else {}
+    return {
+        "resourceId": resource_id,
+        "stencil": {"id": stencil},
+        "properties": properties,
+        "outgoing": [{"resourceId": target} for target in outgoing],
+        "childShapes": [],
+    }
+
+
+def test_model_without_start_candidate():
+    model = {
+        "childShapes": [
+            shape("a", "Task", ["a-b"], "a"),
+            shape("a-b", "SequenceFlow", ["b"]),
+            shape("b", "Task", ["b-a"], "b"),
+            shape("b-a", "SequenceFlow", ["a"]),
+        ]
+    }
+    assert not scan_model(deepcopy(model)).has_start_candidate
+    parser = Parser(model, False, False)
+    parser.run()
+    assert not parser.has_start()
+
+
+def test_models_are_filtered_before_parsing():
+    assert skip_model(scan_model(load_test_model(NESTED_LANES_DIAGRAM))) is False
+    assert skip_compared_model(scan_model(load_test_model(OR_GATEWAY_DIAGRAM)))
+    assert skip_compared_model(scan_model(load_test_model(MULTIPLE_STARTS_DIAGRAM)))
+    assert skip_model(scan_model({"childShapes": [shape("a", "Task", [], "a")]}))
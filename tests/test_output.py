@@ -0,0 +1,114 @@
+import io
+import json
+import subprocess
+import sys
+import pytest
+from bpmnconstraints.script import run
+from bpmnconstraints.utils.output import OutputWriter
+from file_constants import LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END
+
+RESULT = [{"DECLARE": "Init[a]"}, {"DECLARE": "End[b]"}]
+
+
+def write(tmp_path, output_format, result=RESULT):
+    path = tmp_path / "output"
+    with OutputWriter(output_format, path) as output:
+        output.write(result)
+    return path
+
+
+def test_json_output_is_indented(tmp_path):
+    path = write(tmp_path, "json")
+    assert path.read_text(encoding="utf-8") == json.dumps(RESULT, indent=2) + "\n"
+
+
+def test_compact_output_is_one_line(tmp_path):
+    path = write(tmp_path, "compact")
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        json.dumps(RESULT, separators=(",", ":"))
+    ]
+
+
+def test_jsonl_output_has_one_line_per_item(tmp_path):
+    path = write(tmp_path, "jsonl")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == RESULT
+
+
+def test_msgpack_output_has_one_object_per_item(tmp_path):
+    msgpack = pytest.importorskip("msgpack")
+    path = write(tmp_path, "msgpack")
+    with open(path, "rb") as file:
+        assert list(msgpack.Unpacker(file)) == RESULT
+
+
+def test_compile_writes_to_output_file(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "constraints.jsonl"
+    arguments = [
+        "bpmnconstraints",
+        "--compile",
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END["path"],
+        "--constraint_type",
+        "DECLARE",
+        "--output-format",
+        "jsonl",
+        "--output",
+        str(path),
+    ]
+    monkeypatch.setattr(sys, "argv", arguments)
+    run()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0]) == "Init[register invoice]"
+    assert "Init[register invoice]" not in capsys.readouterr().out
+
+
+def test_jsonl_items_are_written_as_produced(tmp_path):
+    path = tmp_path / "output"
+
+    def items(output):
+        for item in RESULT:
+            yield item
+            output.target.flush()
+            assert json.loads(path.read_text(encoding="utf-8").splitlines()[-1]) == item
+
+    with OutputWriter("jsonl", path) as output:
+        output.write_items(items(output))
+
+
+def test_json_items_are_written_as_one_list(tmp_path):
+    path = tmp_path / "output"
+    with OutputWriter("json", path) as output:
+        output.write_items(iter(RESULT))
+        output.write_items(iter([]))
+    assert path.read_text(encoding="utf-8") == json.dumps(RESULT, indent=2) + "\n"
+
+
+def compile_to_stdout(output_format):
+    arguments = [
+        sys.executable,
+        "-c",
+        "from bpmnconstraints.script import run; run()",
+        "--compile",
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END["path"],
+        "--constraint_type",
+        "DECLARE",
+        "--output_format",
+        output_format,
+    ]
+    return subprocess.run(arguments, capture_output=True, check=True)
+
+
+def test_jsonl_on_stdout_holds_only_constraints():
+    process = compile_to_stdout("jsonl")
+    lines = process.stdout.decode("utf-8").splitlines()
+    assert json.loads(lines[0]) == "Init[register invoice]"
+    assert all(isinstance(json.loads(line), str) for line in lines)
+    assert b"Generating DECLARE constraints" in process.stderr
+
+
+def test_msgpack_on_stdout_holds_only_constraints():
+    msgpack = pytest.importorskip("msgpack")
+    process = compile_to_stdout("msgpack")
+    constraints = list(msgpack.Unpacker(io.BytesIO(process.stdout)))
+    assert constraints[0] == "Init[register invoice]"
+    assert all(isinstance(constraint, str) for constraint in constraints)
@@ -1,6 +1,10 @@
+import json
+import sys
+from bpmnconstraints.script import run
 from file_constants import (
     LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
     PARALLEL_GATEWAY_DIAGRAM,
+    SIMPLE_LOOP_DIAGRAM,
 )
 from test_utils import init_test_setup_for_parser
 
@@ -41,3 +45,50 @@ def test_transative_closure_between_elements_before_and_after_gateway_construct_
         if elem.get("is start"):
             transitive_elems = [x.get("id") for x in elem.get("transitivity")]
             assert PARALLEL_GATEWAY_DIAGRAM.get("ending element id") in transitive_elems
+
+
+def test_loop_elements_are_in_their_own_transative_closure():
+    res = init_test_setup_for_parser(SIMPLE_LOOP_DIAGRAM)
+    for elem in res:
+        if elem.get("id") in SIMPLE_LOOP_DIAGRAM.get("loop elements"):
+            transitive_elems = [x.get("id") for x in elem.get("transitivity")]
+            for loop_elem in SIMPLE_LOOP_DIAGRAM.get("loop elements"):
+                assert loop_elem in transitive_elems
+
+
+def test_loop_elements_are_in_their_own_transative_closure_xml():
+    res = init_test_setup_for_parser(SIMPLE_LOOP_DIAGRAM, True)
+    for elem in res:
+        if elem.get("id") in SIMPLE_LOOP_DIAGRAM.get("loop elements"):
+            transitive_elems = [x.get("id") for x in elem.get("transitivity")]
+            for loop_elem in SIMPLE_LOOP_DIAGRAM.get("loop elements"):
+                assert loop_elem in transitive_elems
+
+
+def test_transative_closure_has_no_duplicates():
+    res = init_test_setup_for_parser(PARALLEL_GATEWAY_DIAGRAM)
+    for elem in res:
+        transitive_elems = [x.get("id") for x in elem.get("transitivity", [])]
+        assert len(transitive_elems) == len(set(transitive_elems))
+
+
+def test_transative_closure_does_not_print(capsys):
+    init_test_setup_for_parser(SIMPLE_LOOP_DIAGRAM)
+    assert capsys.readouterr().out == ""
+
+
+def test_parse_loop_with_transitivity_writes_ids(monkeypatch, capsys):
+    arguments = [
+        "bpmnconstraints",
+        "--parse",
+        SIMPLE_LOOP_DIAGRAM["path"],
+        "--transitivity",
+        "True",
+    ]
+    monkeypatch.setattr(sys, "argv", arguments)
+    run()
+    res = json.loads(capsys.readouterr().out)
+    for elem in res:
+        if elem.get("id") in SIMPLE_LOOP_DIAGRAM.get("loop elements"):
+            for loop_elem in SIMPLE_LOOP_DIAGRAM.get("loop elements"):
+                assert loop_elem in elem.get("transitivity")
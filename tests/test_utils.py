@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 from bpmnconstraints.parser.bpmn_parser import Parser
 from bpmnconstraints.compiler.bpmn_compiler import Compiler
@@ -13,6 +14,18 @@ def init_test_setup_for_parser(diagram_constant, test_xml=False):
         return res
 
 
+def init_test_parser(diagram_constant, test_xml=False, transitivity=False):
+    path = Path(diagram_constant["xmlpath" if test_xml else "path"])
+    parser = Parser(path, True, transitivity)
+    parser.run()
+    return parser
+
+
+def load_test_model(diagram_constant):
+    with open(diagram_constant["path"], "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
 def init_test_setup_for_compiler(diagram_constant, test_xml=False):
     path = Path(diagram_constant["xmlpath" if test_xml else "path"])
     constraints = []
@@ -1,5 +1,7 @@
 from json import JSONDecodeError
+from xml.etree import ElementTree
 from pytest import raises
+from bpmnconstraints.parser.xml_model import XmlModel, iterparse_bpmn
 from file_constants import (
     LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END,
     REQUIREMENTS_TXT,
@@ -48,3 +50,23 @@ def test_that_xml_and_json_compiling_generates_same_output():
     )
 
     assert sorted(json) == sorted(xml)
+
+
+def test_xml_elements_are_converted_once():
+    root = ElementTree.parse(
+        LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END.get("xmlpath")
+    ).getroot()
+    model = XmlModel(root)
+    assert model.get_diagram_elements() is model.get_diagram_elements()
+
+
+def test_streamed_xml_skips_diagram_interchange():
+    root = iterparse_bpmn(LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END.get("xmlpath"))
+    assert root.find(".//{http://www.omg.org/spec/BPMN/20100524/DI}BPMNDiagram") is None
+
+
+def test_streamed_xml_keeps_process_elements():
+    path = LINEAR_SEQUENCE_DIAGRAM_WITH_START_AND_END.get("xmlpath")
+    streamed = XmlModel(iterparse_bpmn(path))
+    loaded = XmlModel(ElementTree.parse(path).getroot())
+    assert streamed.get_diagram_elements() == loaded.get_diagram_elements()